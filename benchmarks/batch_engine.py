@@ -0,0 +1,103 @@
+"""
+Batch engine benchmark: BatchGame (NumPy) vs Game objects
+
+First checks that BatchGame follows the object model: the same games are
+stepped both ways with the same random HIT/DODGE script, and the state is
+compared after every tick. Then measures game-steps per second for both.
+
+Usage: python -m benchmarks.batch_engine --games 10000 --ticks 600
+"""
+import argparse
+import random
+import sys
+import time
+import numpy as np
+from models.game import Game
+from models.batch import BatchGame
+from config.constants import *
+
+FLOAT_FIELDS = ('ball_angle', 'ball_speed', 'ball_direction', 'ball_spawn_timer', 'x', 'y',
+                'dodge_timer', 'swing_timer', 'hit_cooldown', 'stick_angle', 'swing_target_angle',
+                'swing_progress', 'fly_velocity_x', 'fly_velocity_y')
+EXACT_FIELDS = ('ball_active', 'state', 'game_over', 'winner')
+
+def random_actions(rng, n, hit_rate=0.05, dodge_rate=0.02):
+    return rng.random((n, 4)) < hit_rate, rng.random((n, 4)) < dodge_rate
+
+def step_games(games, dt, hits, dodges):
+    """Same order as BatchGame.step: all dodges, then hits in player order, then update"""
+    for i, game in enumerate(games):
+        if game.game_over:
+            continue
+        for j, player in enumerate(game.players):
+            if dodges[i, j]:
+                player.start_dodge()
+        for j, player in enumerate(game.players):
+            if hits[i, j]:
+                player.hit_ball(game.ball)
+        game.update(dt)
+
+def compare(batch, games):
+    """Largest float difference and the names of fields whose discrete values differ"""
+    reference = BatchGame.from_games(games)
+    worst = max(float(np.max(np.abs(getattr(batch, name) - getattr(reference, name)))) for name in FLOAT_FIELDS)
+    mismatched = [name for name in EXACT_FIELDS if not np.array_equal(getattr(batch, name), getattr(reference, name))]
+    return worst, mismatched
+
+def check_equivalence(n_games, n_ticks, dt, seed):
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+    games = [Game() for _ in range(n_games)]
+    batch = BatchGame.from_games(games)
+
+    worst = 0.0
+    for tick in range(n_ticks):
+        hits, dodges = random_actions(rng, n_games)
+        step_games(games, dt, hits, dodges)
+        batch.step(dt, hits, dodges)
+        difference, mismatched = compare(batch, games)
+        worst = max(worst, difference)
+        if mismatched or difference > 1e-6:
+            return tick, worst, mismatched
+    return None, worst, []
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--check-games', type=int, default=200)
+    parser.add_argument('--check-ticks', type=int, default=1200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    dt = 1.0 / SERVER_TICK_RATE
+
+    failed_tick, worst, mismatched = check_equivalence(args.check_games, args.check_ticks, dt, args.seed)
+    if failed_tick is not None:
+        print(f"MISMATCH at tick {failed_tick}: fields {mismatched}, max float difference {worst:.3g}")
+        sys.exit(1)
+    print(f"equivalence: {args.check_games} games x {args.check_ticks} ticks match "
+          f"(max float difference {worst:.3g})")
+
+    rng = np.random.default_rng(args.seed)
+    script = [random_actions(rng, args.games) for _ in range(args.ticks)]
+
+    batch = BatchGame(args.games, seed=args.seed)
+    start = time.perf_counter()
+    for hits, dodges in script:
+        batch.step(dt, hits, dodges)
+    batch_rate = args.games * args.ticks / (time.perf_counter() - start)
+
+    # The object model is much slower; time a slice of the games and scale
+    n_objects = min(args.games, 500)
+    games = [Game() for _ in range(n_objects)]
+    start = time.perf_counter()
+    for hits, dodges in script:
+        step_games(games, dt, hits[:n_objects], dodges[:n_objects])
+    object_rate = n_objects * args.ticks / (time.perf_counter() - start)
+
+    print(f"  Game objects: {object_rate:12,.0f} game-steps/s")
+    print(f"     BatchGame: {batch_rate:12,.0f} game-steps/s ({batch_rate / object_rate:.1f}x)")
+    print(f"games finished in batch: {batch.game_over.sum()} / {args.games}")
+
+if __name__ == "__main__":
+    main()
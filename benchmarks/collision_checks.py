@@ -0,0 +1,79 @@
+"""
+Collision benchmark: angle checks on the orbit vs sqrt distance checks
+
+Sweeps the ball around the planet and checks that the angular collision and
+hit-range tests agree with the Euclidean ones they replaced, then times
+Game.check_collisions and a hit-range test both ways.
+
+Usage: python -m benchmarks.collision_checks --steps 100000
+"""
+import argparse
+import math
+import timeit
+from models.game import Game
+from models.player_state import PlayerState
+from models.geometry import SEAT_ANGLES, COLLISION_ARC, HIT_ARC, angle_between
+from config.constants import *
+
+# The checks as they were: ball position from cos/sin, then a sqrt distance
+def sqrt_collides(ball, player):
+    ball_pos = ball.get_position()
+    distance = math.sqrt((ball_pos[0] - player.x)**2 + (ball_pos[1] - player.y)**2)
+    return distance < BALL_RADIUS + PLAYER_RADIUS
+
+def sqrt_in_hit_range(ball, player):
+    ball_pos = ball.get_position()
+    return math.sqrt((player.x - ball_pos[0])**2 + (player.y - ball_pos[1])**2) <= HIT_RANGE
+
+def sqrt_check_collisions(game):
+    for player in game.players:
+        if player.state in [PlayerState.ELIMINATED, PlayerState.DODGING, PlayerState.FLYING_OFF]:
+            continue
+        if sqrt_collides(game.ball, player):
+            break
+
+def sweep(steps):
+    """Ball angles where the new and old tests disagree, and how far they are from the edge"""
+    game = Game(seed=0)
+    ball = game.ball
+    disagreements = []
+    for step in range(steps):
+        ball.angle = 2 * math.pi * step / steps
+        for player in game.players:
+            old = (sqrt_collides(ball, player), sqrt_in_hit_range(ball, player))
+            arc = angle_between(ball.angle, player.angle)
+            new = (arc < COLLISION_ARC, arc <= HIT_ARC)
+            if old != new:
+                disagreements.append(min(abs(arc - COLLISION_ARC), abs(arc - HIT_ARC)))
+    return disagreements
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--steps', type=int, default=100000)
+    parser.add_argument('--calls', type=int, default=100000)
+    args = parser.parse_args()
+
+    disagreements = sweep(args.steps)
+    if any(distance > 1e-9 for distance in disagreements):
+        print(f"MISMATCH: {len(disagreements)} disagreements, up to {max(disagreements):.3g} rad from the edge")
+        raise SystemExit(1)
+    print(f"{args.steps} ball angles x 4 players: angle checks agree with the sqrt checks"
+          f"{f' (except {len(disagreements)} within 1e-9 rad of the edge)' if disagreements else ''}")
+
+    game = Game(seed=0)
+    game.ball.is_active = True
+    game.ball.angle = SEAT_ANGLES[1] + 0.5  # Near player 2, touching nobody: every player is checked
+    game.ball.x, game.ball.y = game.ball.get_position()
+    player = game.players[1]
+    cases = [
+        ('check_collisions', lambda: sqrt_check_collisions(game), game.check_collisions),
+        ('hit range', lambda: sqrt_in_hit_range(game.ball, player),
+         lambda: angle_between(game.ball.angle, player.angle) <= HIT_ARC)
+    ]
+    for label, old, new in cases:
+        old_ns = min(timeit.repeat(old, number=args.calls, repeat=3)) / args.calls * 1e9
+        new_ns = min(timeit.repeat(new, number=args.calls, repeat=3)) / args.calls * 1e9
+        print(f"{label:>16}: sqrt {old_ns:7.1f} ns, angle {new_ns:7.1f} ns ({old_ns / new_ns:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Framing benchmark: length-prefixed frames with recv_into vs newline-split str buffers
+
+Streams a mix of PLAYER_ACTION, SNAPSHOT_ACK, PING and ROOM_UPDATE messages
+(Vietnamese player names) over a socket pair, paced at --rate messages/sec
+and then as one unpaced burst. The receiver runs the old loop
+(recv().decode(), buffer +=, split('\\n', 1)) or FrameDecoder.recv_into and
+reports its CPU use, throughput and how many names arrived mangled.
+
+Usage: python -m benchmarks.framing --rate 10000 --duration 3
+"""
+import argparse
+import socket
+import threading
+import time
+from network.protocol import *
+
+NAMES = ['Nguyễn Văn Ánh', 'Trần Thị Ngọc', 'Lê Hoàng Đức', 'Phạm Quỳnh Hương']
+
+def make_messages():
+    """One round of the message mix"""
+    return [
+        create_action_message(ActionType.HIT, seq=1, seen_time=12.5),
+        NetworkMessage(MessageType.SNAPSHOT_ACK, {'seq': 42}),
+        create_ping_message(1234.5678),
+        NetworkMessage(MessageType.ROOM_UPDATE, {
+            'room_id': 'AB12', 'players_count': 4, 'max_players': 4, 'player_names': NAMES
+        })
+    ]
+
+def mangled(message):
+    """True for a ROOM_UPDATE whose names did not survive the trip"""
+    return message.type == MessageType.ROOM_UPDATE and message.data['player_names'] != NAMES
+
+# The receive loop as it was in GameServer.handle_client and the clients; 'replace' keeps it running
+# where the old code raised UnicodeDecodeError on a name split between two reads
+def line_receiver(sock, count):
+    received = bad = 0
+    buffer = ""
+    while received < count:
+        data = sock.recv(4096).decode('utf-8', 'replace')
+        if not data:
+            break
+        buffer += data
+        while '\n' in buffer:
+            line, buffer = buffer.split('\n', 1)
+            message = NetworkMessage.from_json(line)
+            if message:
+                received += 1
+                bad += mangled(message)
+    return received, bad
+
+def frame_receiver(sock, count):
+    received = bad = 0
+    decoder = FrameDecoder()
+    while received < count:
+        messages = decoder.recv_into(sock)
+        if messages is None:
+            break
+        for message in messages:
+            received += 1
+            bad += mangled(message)
+    return received, bad
+
+def encode_lines(messages):
+    return [(message.to_json() + '\n').encode() for message in messages]
+
+def encode_frames(messages):
+    return [message.encode() for message in messages]
+
+def send_stream(sock, chunks, count, rate):
+    """Send `count` messages, paced at `rate` per second in 1 ms batches (all at once if rate is None)"""
+    if rate is None:
+        stream = b''.join(chunks)
+        sock.sendall(stream * (count // len(chunks)))
+        return
+    batch = max(1, rate // 1000)
+    blob = b''.join(chunks[i % len(chunks)] for i in range(batch))
+    start = time.perf_counter()
+    for sent in range(0, count, batch):
+        delay = start + sent / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        sock.sendall(blob)
+
+def run(receiver, chunks, count, rate):
+    """(messages received, names mangled, receiver CPU seconds, wall seconds)"""
+    sender, receiver_sock = socket.socketpair()
+    thread = threading.Thread(target=send_stream, args=(sender, chunks, count, rate))
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    thread.start()
+    received, bad = receiver(receiver_sock, count)
+    cpu = time.thread_time() - cpu
+    wall = time.perf_counter() - wall
+    thread.join()
+    sender.close()
+    receiver_sock.close()
+    return received, bad, cpu, wall
+
+def check():
+    """Frames fed in every chunk size from 1 byte up decode to the messages sent"""
+    messages = make_messages()
+    stream = b''.join(encode_frames(messages))
+    expected = [message.to_json() for message in messages]
+    for chunk in range(1, 64):
+        decoder = FrameDecoder(size=16)  # Tiny buffer: exercises compaction and growth
+        decoded = []
+        for start in range(0, len(stream), chunk):
+            decoded += decoder.feed(stream[start:start + chunk])
+        assert [message.to_json() for message in decoded] == expected, chunk
+    # And the old way: count the reads that split a name's UTF-8 bytes
+    lines = b''.join(encode_lines(messages))
+    splits = 0
+    for chunk in range(1, 64):
+        for start in range(0, len(lines), chunk):
+            try:
+                lines[start:start + chunk].decode()
+            except UnicodeDecodeError:
+                splits += 1
+    return splits
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rate', type=int, default=10000, help="messages/sec per connection")
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--burst', type=int, default=200000, help="messages in the unpaced run")
+    args = parser.parse_args()
+
+    splits = check()
+    print(f"frames decode intact at every chunk size; newline reads split a UTF-8 name {splits} times")
+
+    messages = make_messages()
+    variants = [('lines', line_receiver, encode_lines(messages)),
+                ('frames', frame_receiver, encode_frames(messages))]
+    paced = int(args.rate * args.duration)
+    for label, receiver, chunks in variants:
+        received, bad, cpu, wall = run(receiver, chunks, paced, args.rate)
+        burst_received, burst_bad, burst_cpu, burst_wall = run(receiver, chunks, args.burst, None)
+        print(f"{label:>6}: {args.rate}/s paced: {cpu / wall:5.1%} of a core, {cpu / received * 1e6:5.2f} us/msg | "
+              f"burst: {burst_received / burst_wall:9,.0f} msgs/s | mangled names {bad + burst_bad}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Geometry benchmark: per-seat tables (models/geometry.py) vs cos/sin per call
+
+Checks that the tables give exactly the values the old trig expressions
+gave, then times each lookup against its trig version and the cost of
+one frame of 4 players (positions plus stick directions).
+
+Usage: python -m benchmarks.geometry_tables --calls 200000
+"""
+import argparse
+import math
+import timeit
+from models.geometry import *
+from config.constants import *
+
+# The per-call computations the tables replace, as they were written in the models and renderers
+def trig_surface_position(angle):
+    x = PLANET_CENTER[0] + (PLANET_RADIUS + PLAYER_RADIUS + 5) * math.cos(angle)
+    y = PLANET_CENTER[1] + (PLANET_RADIUS + PLAYER_RADIUS + 5) * math.sin(angle)
+    return (x, y)
+
+def trig_dodge_position(angle):
+    x = PLANET_CENTER[0] + (PLANET_RADIUS - PLAYER_RADIUS//2) * math.cos(angle)
+    y = PLANET_CENTER[1] + (PLANET_RADIUS - PLAYER_RADIUS//2) * math.sin(angle)
+    return (x, y)
+
+def trig_stick_direction(player_id, stick_angle):
+    if player_id == 0:
+        base_angle = 0
+    elif player_id == 1:
+        base_angle = math.pi/2
+    elif player_id == 2:
+        base_angle = math.pi
+    else:
+        base_angle = -math.pi/2
+    angle = base_angle + math.radians(stick_angle)
+    return (math.cos(angle), math.sin(angle))
+
+def trig_spawn_angle(pair):
+    angle1 = pair * (2 * math.pi / 4)
+    angle2 = ((pair + 1) % 4) * (2 * math.pi / 4)
+    angle = (angle1 + angle2) / 2
+    if pair == 3:
+        angle = (angle1 + (angle2 + 2 * math.pi)) / 2
+        if angle >= 2 * math.pi:
+            angle -= 2 * math.pi
+    return angle
+
+def trig_frame():
+    for seat in range(NUM_SEATS):
+        trig_surface_position(SEAT_ANGLES[seat])
+        trig_stick_direction(seat, 0)
+
+def table_frame():
+    for seat in range(NUM_SEATS):
+        SURFACE_POSITIONS[seat]
+        stick_direction(seat, 0)
+
+def check():
+    for seat in range(NUM_SEATS):
+        angle = SEAT_ANGLES[seat]
+        assert SURFACE_POSITIONS[seat] == trig_surface_position(angle), seat
+        assert DODGE_POSITIONS[seat] == trig_dodge_position(angle), seat
+        assert SPAWN_ANGLES[seat] == trig_spawn_angle(seat), seat
+        for stick_angle in (0, 12.5, -90):
+            expected = trig_stick_direction(seat, stick_angle)
+            assert all(math.isclose(a, b, abs_tol=1e-15) for a, b in zip(stick_direction(seat, stick_angle), expected))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200000)
+    args = parser.parse_args()
+
+    check()
+    print("tables match the trig expressions")
+
+    cases = [
+        ('surface position', lambda: trig_surface_position(SEAT_ANGLES[1]), lambda: SURFACE_POSITIONS[1]),
+        ('dodge position', lambda: trig_dodge_position(SEAT_ANGLES[1]), lambda: DODGE_POSITIONS[1]),
+        ('resting stick', lambda: trig_stick_direction(3, 0), lambda: stick_direction(3, 0)),
+        ('ball spawn angle', lambda: trig_spawn_angle(3), lambda: SPAWN_ANGLES[3]),
+        ('frame, 4 players', trig_frame, table_frame)
+    ]
+    for label, trig, table in cases:
+        trig_ns = min(timeit.repeat(trig, number=args.calls, repeat=3)) / args.calls * 1e9
+        table_ns = min(timeit.repeat(table, number=args.calls, repeat=3)) / args.calls * 1e9
+        print(f"{label:>17}: trig {trig_ns:7.1f} ns, table {table_ns:7.1f} ns ({trig_ns / table_ns:.1f}x)")
+
+if __name__ == "__main__":
+    main()
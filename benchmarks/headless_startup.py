@@ -0,0 +1,80 @@
+"""
+Headless benchmark: process startup without pygame, and simulate() speed
+
+Starts fresh interpreters that import the headless modules and reports the
+median startup time, next to one that also imports pygame for comparison.
+Fails if any headless module pulls pygame in. Then runs simulate() with a
+random action script and reports how much faster than real time it is.
+
+Usage: python -m benchmarks.headless_startup --runs 10 --ticks 36000
+"""
+import argparse
+import random
+import statistics
+import subprocess
+import sys
+import time
+from config.constants import SERVER_TICK_RATE
+
+HEADLESS_MODULES = ['models.game', 'models.simulation', 'network.server', 'network.async_server']
+
+def startup_time(imports, block_pygame):
+    """Wall time of a fresh interpreter that imports `imports` and exits"""
+    code = "import sys\n"
+    if block_pygame:
+        code += "sys.modules['pygame'] = None\n"  # Any `import pygame` now raises ImportError
+    code += "".join(f"import {name}\n" for name in imports)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1])
+        return None
+    return elapsed
+
+def measure(label, imports, runs, block_pygame=False):
+    samples = []
+    for _ in range(runs):
+        elapsed = startup_time(imports, block_pygame)
+        if elapsed is None:
+            print(f"{label}: import failed")
+            return None
+        samples.append(elapsed)
+    median = statistics.median(samples)
+    print(f"{label:>20}: {median * 1000:7.1f} ms median startup")
+    return median
+
+def random_script(n_ticks, seed, rate=0.02):
+    rng = random.Random(seed)
+    for tick in range(n_ticks):
+        for player_id in range(4):
+            if rng.random() < rate:
+                yield tick, player_id, rng.choice(['hit', 'dodge'])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--ticks', type=int, default=36000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    measure("python only", [], args.runs)
+    if measure("headless modules", HEADLESS_MODULES, args.runs, block_pygame=True) is None:
+        sys.exit(1)
+    measure("with pygame", HEADLESS_MODULES + ['pygame'], args.runs)
+
+    from models.simulation import simulate
+    random.seed(args.seed)
+    ticks = games = 0
+    start = time.perf_counter()
+    # Games end early, so play several until the tick budget is used up
+    while ticks < args.ticks:
+        game, played = simulate(args.ticks - ticks, random_script(args.ticks - ticks, args.seed + games))
+        ticks += played
+        games += 1
+    elapsed = time.perf_counter() - start
+    print(f"simulate(): {games} games, {ticks / elapsed:,.0f} ticks/s, "
+          f"{ticks / SERVER_TICK_RATE / elapsed:,.0f}x real time at {SERVER_TICK_RATE} Hz")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Model benchmark: slotted Player/Ball vs the same classes with a __dict__
+
+Builds N rooms' worth of games both ways and reports the memory they take
+(less each game's RNG, which is the same for both), then the CPU time of a
+tick per game: Game.update plus the attribute reads of a snapshot.
+
+Usage: python -m benchmarks.model_slots --rooms 10000 --ticks 60
+"""
+import argparse
+import contextlib
+import gc
+import random
+import time
+import tracemalloc
+import models.game
+from models.game import Game
+from models.player import Player
+from models.ball import Ball
+
+def without_slots(cls):
+    """Copy of a slotted class whose instances keep their attributes in a __dict__ again"""
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in cls.__slots__ and name != '__slots__'}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+@contextlib.contextmanager
+def model_classes(player_cls, ball_cls):
+    """Make Game build its players and ball from the given classes"""
+    models.game.Player, models.game.Ball = player_cls, ball_cls
+    try:
+        yield
+    finally:
+        models.game.Player, models.game.Ball = Player, Ball
+
+def make_games(n, seed):
+    random.seed(seed)
+    return [Game() for _ in range(n)]
+
+def traced_memory(build):
+    """Bytes still allocated by what build() returns"""
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return memory
+
+def serialize(game):
+    """The per-player reads GameRoom.serialize_game_state does"""
+    return [(p.id, p.x, p.y, p.state.value, p.stick_angle, p.color) for p in game.players]
+
+def tick_cost(n, ticks, seed):
+    """Seconds per game per tick"""
+    dt = 1.0 / 60
+    games = make_games(n, seed)
+    for game in games:
+        game.ball.spawn_timer = 0  # Skip the spawn countdown: time ticks with the ball in play
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for game in games:
+            game.update(dt)
+            serialize(game)
+    return (time.perf_counter() - start) / (n * ticks)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rooms', type=int, default=10000)
+    parser.add_argument('--ticks', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    # Each game's RNG is the same either way; leave it out so the difference is visible
+    rng_memory = traced_memory(lambda: [random.Random(seed) for seed in range(args.rooms)])
+
+    variants = [
+        ('__dict__', without_slots(Player), without_slots(Ball)),
+        ('__slots__', Player, Ball)
+    ]
+    memory = {}
+    cost = {label: [] for label, _, _ in variants}
+    for label, player_cls, ball_cls in variants:
+        with model_classes(player_cls, ball_cls):
+            memory[label] = traced_memory(lambda: make_games(args.rooms, args.seed)) - rng_memory
+    # Alternate the variants and keep the best run of each, so machine noise hits both alike
+    for _ in range(args.repeat):
+        for label, player_cls, ball_cls in variants:
+            with model_classes(player_cls, ball_cls):
+                cost[label].append(tick_cost(args.rooms, args.ticks, args.seed))
+
+    for label, _, _ in variants:
+        print(f"{label:>9}: games without RNG {memory[label] / 2**20:6.2f} MiB for {args.rooms} rooms "
+              f"({memory[label] / args.rooms:,.0f} B/room), tick {min(cost[label]) * 1e6:6.2f} us/game")
+
+    dict_memory, slot_memory = memory['__dict__'], memory['__slots__']
+    dict_cost, slot_cost = min(cost['__dict__']), min(cost['__slots__'])
+    print(f"slots save {1 - slot_memory / dict_memory:.0%} memory and {1 - slot_cost / dict_cost:.0%} tick time")
+
+if __name__ == "__main__":
+    main()
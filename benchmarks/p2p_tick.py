@@ -0,0 +1,123 @@
+"""
+P2P host benchmark: tick jitter with the simulation on the host loop vs in the render loop
+
+Runs a P2PHost on loopback with 3 peers while the main thread plays the
+host's window: FPS frames of --render-ms CPU work, with a --hitch-ms stall
+every --hitch-every frames (asset load, GC, window drag). Ticks are timed
+on the host and GAME_STATE arrivals at each peer, both for the host's own
+fixed-tick selectors loop and for the old scheme where the render loop
+called update_game once per frame with the frame's dt.
+
+Usage: python -m benchmarks.p2p_tick --duration 5
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import statistics
+import time
+from p2p_multiplayer import P2PHost, P2PClient
+from config.constants import *
+
+class RenderDrivenHost(P2PHost):
+    """The old scheme: the host loop only does networking, the render loop simulates"""
+    def start(self, port=12345):
+        self.scheduler.due_steps = lambda now: 0
+        self.scheduler.time_until_next_tick = lambda now: 0.005
+        return super().start(port)
+
+    def frame(self, dt):
+        """What the render loop used to call every frame"""
+        tick_start = time.perf_counter()
+        while self.calls:
+            self.calls.popleft()()
+        if self.game_started:
+            for player_id, action in self.inputs.drain():
+                self.apply_action(player_id, action)
+            self.game.update(dt)
+            self.broadcast({'type': 'game_state', 'state': self.create_game_state()})
+        self.tick_stats.append((tick_start, time.perf_counter() - tick_start))
+
+class TimedClient(P2PClient):
+    """Peer that records when each GAME_STATE arrives"""
+    def __init__(self):
+        super().__init__()
+        self.arrivals = []
+
+    def handle_message(self, msg):
+        if msg['type'] == 'game_state':
+            self.arrivals.append(time.perf_counter())
+        super().handle_message(msg)
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def intervals(times):
+    return [(b - a) * 1000 for a, b in zip(times, times[1:])]
+
+def summary(ms):
+    ms = sorted(ms)
+    p99 = ms[int(len(ms) * 0.99)]
+    return f"p50 {statistics.median(ms):5.1f} p99 {p99:5.1f} max {ms[-1]:5.1f} ms, jitter {statistics.pstdev(ms):5.2f} ms"
+
+def run_peers(port, duration, results):
+    """Peer process (the peers are other machines, not threads fighting the host for the GIL)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        peers = [TimedClient() for _ in range(3)]
+        for i, peer in enumerate(peers):
+            peer.connect('127.0.0.1', port, 'BNCH', f'Peer {i}')
+        time.sleep(duration)
+        for peer in peers:
+            peer.disconnect()
+    results.put([ms for peer in peers for ms in intervals(peer.arrivals[5:])])
+
+def run(host_cls, port, args):
+    host = host_cls('BNCH', 'Host')
+    host.start(port)
+    results = multiprocessing.Queue()
+    peer_process = multiprocessing.Process(target=run_peers, args=(port, args.duration + 1.0, results))
+    peer_process.start()
+    while not host.game_started:
+        time.sleep(0.01)
+    host.tick_stats.clear()
+
+    frame_time = 1.0 / FPS
+    last = time.perf_counter()
+    end = last + args.duration
+    frame = 0
+    while last < end:
+        # clock.tick(FPS): sleep out the rest of the frame, then take its dt
+        time.sleep(max(0.0, last + frame_time - time.perf_counter()))
+        now = time.perf_counter()
+        dt, last = now - last, now
+        if isinstance(host, RenderDrivenHost):
+            host.frame(dt)
+        frame += 1
+        busy(args.hitch_ms / 1000 if frame % args.hitch_every == 0 else args.render_ms / 1000)
+
+    ticks = intervals([start for start, _ in host.tick_stats])
+    arrivals = results.get()
+    peer_process.join()
+    host.stop()
+    time.sleep(0.1)
+    return ticks, arrivals
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--render-ms', type=float, default=4.0)
+    parser.add_argument('--hitch-ms', type=float, default=60.0)
+    parser.add_argument('--hitch-every', type=int, default=30)
+    parser.add_argument('--port', type=int, default=23456)
+    args = parser.parse_args()
+
+    for offset, (label, host_cls) in enumerate((('render loop', RenderDrivenHost), ('host loop', P2PHost))):
+        with contextlib.redirect_stdout(io.StringIO()):  # Join and action logs
+            ticks, arrivals = run(host_cls, args.port + offset, args)
+        print(f"{label:>11}: host ticks    {summary(ticks)}")
+        print(f"{'':>11}  peer arrivals {summary(arrivals)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Render benchmark: GameRenderer frame time with its caches vs drawing everything every frame
+
+Plays a seeded game with random HITs and DODGEs on the SDL dummy video
+driver (no window) and renders every frame twice: with GameRenderer, which
+blits the cached background, text and circle sprites, and with a renderer
+that re-renders text and redraws the planet and every circle each frame
+as before. Both local and online frames (with a changing RTT readout) are
+timed, each renderer in its own pass over the same game, and then every
+frame is compared pixel for pixel.
+
+Usage: python -m benchmarks.render_cache --frames 3600
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+from config.constants import *
+from models.game import Game, HIT, DODGE
+from views.game_renderer import GameRenderer
+
+class UncachedRenderer(GameRenderer):
+    """Draws every frame from scratch, as GameRenderer did before its caches"""
+    def text(self, font, text, color):
+        return font.render(text, True, color)
+
+    def circle(self, screen, color, center, radius, width=0):
+        pygame.draw.circle(screen, color, center, radius, width)
+
+    def draw_background(self, screen, draw_static):
+        screen.fill(WHITE)
+        self.draw_planet(screen)
+        draw_static(screen)
+
+def online_state(game):
+    """The game as render_online_game receives it"""
+    return {
+        'players': [{'id': player.id, 'x': player.x, 'y': player.y, 'state': player.state.value,
+                     'stick_angle': player.stick_angle, 'color': list(player.color)}
+                    for player in game.players],
+        'ball': {'x': game.ball.x, 'y': game.ball.y, 'is_active': game.ball.is_active,
+                 'spawn_timer': game.ball.spawn_timer},
+        'game_over': game.game_over,
+        'winner_id': game.winner.id if game.winner else None
+    }
+
+def play(frames, seed):
+    """The same seeded game every time: (frame, game, online state, net stats) per frame"""
+    rng = random.Random(seed)
+    game = Game(seed=seed)
+    over_frames = 0
+    for frame in range(frames):
+        for player_id in range(4):
+            if rng.random() < 0.02:
+                game.apply_action(player_id, rng.choice((HIT, DODGE)))
+        game.update(1.0 / FPS)
+        if game.game_over:
+            over_frames += 1
+            if over_frames > FPS:  # A second on the game over screen, then play again
+                game.reset()
+                over_frames = 0
+        net_stats = {'rtt_ms': rng.uniform(20, 80), 'jitter_ms': rng.uniform(0, 10)}
+        yield frame, game, online_state(game), net_stats
+
+def timed(render):
+    start = time.perf_counter()
+    render()
+    return time.perf_counter() - start
+
+def summary(seconds):
+    us = sorted(s * 1e6 for s in seconds)
+    return f"mean {statistics.fmean(us):6.1f} p50 {statistics.median(us):6.1f} p99 {us[int(len(us) * 0.99)]:6.1f} us"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=3600)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    before, after = UncachedRenderer(), GameRenderer()
+    clock = [0]
+    pygame.time.get_ticks = lambda: clock[0]  # Same countdown pulse for both renderers
+
+    times = {}
+    for label, renderer in (('before', before), ('after', after)):
+        local, online = times[('local', label)], times[('online', label)] = [], []
+        for frame, game, state, net_stats in play(args.frames, args.seed):
+            clock[0] = frame * 1000 // FPS
+            local.append(timed(lambda: renderer.render(screen, game)))
+            online.append(timed(lambda: renderer.render_online_game(screen, state, frame % 4, net_stats)))
+
+    identical = 0
+    for frame, game, state, net_stats in play(args.frames, args.seed):
+        clock[0] = frame * 1000 // FPS
+        pixels = []
+        for renderer in (before, after):
+            renderer.render(screen, game)
+            local = pygame.image.tobytes(screen, 'RGB')
+            renderer.render_online_game(screen, state, frame % 4, net_stats)
+            pixels.append((local, pygame.image.tobytes(screen, 'RGB')))
+        identical += pixels[0] == pixels[1]
+
+    print(f"{args.frames} frames at {SCREEN_WIDTH}x{SCREEN_HEIGHT} ({pygame.display.get_driver()} driver), "
+          f"identical pixels in {identical}")
+    for view in ('local', 'online'):
+        for label in ('before', 'after'):
+            print(f"{view:>6} {label:>6}: {summary(times[(view, label)])}")
+        speedup = statistics.fmean(times[(view, 'before')]) / statistics.fmean(times[(view, 'after')])
+        print(f"{'':>13} {speedup:.2f}x faster")
+    print(f"cached: {len(after.text_cache)} text surfaces, {len(after.sprites)} sprites, "
+          f"{len(after.backgrounds)} backgrounds")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Soak benchmark: room create/join/leave cycles against one GameServer
+
+Drives the server's message handlers directly with stand-in connections.
+Each cycle a host creates a room, a guest joins, and both leave; every
+--abandon-th host stays behind and never plays, so its room has to expire
+(ROOM_IDLE_TIMEOUT). The room clock advances one tick per cycle. Reports
+rooms alive, index size, live objects and allocated memory blocks
+(tracemalloc would slow the run several times over), and the cost of dispatching one
+PLAYER_ACTION through the connection index and through the old scan of
+every room, which was all the server had while rooms were never deleted.
+
+Usage: python -m benchmarks.room_soak --cycles 1000000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import sys
+import time
+import timeit
+from network.server import GameServer, GameRoom
+from network.protocol import *
+from config.constants import *
+
+CREATE_ROOM = NetworkMessage(MessageType.CREATE_ROOM, {'player_name': 'Host'})
+
+class NullConnection:
+    """Stands in for a client connection: accepts and discards everything"""
+    udp_token = None
+
+    def send(self, data, snapshot=False):
+        return len(data)
+
+def scan_dispatch(server, connection, data):
+    """PLAYER_ACTION dispatch as it was: look through every room for the sender"""
+    for room in server.rooms.values():
+        if connection in room.players:
+            room.handle_player_action(connection, data.get('action'), data.get('seq'), data.get('time'))
+            break
+
+def dispatch_cost(server, rooms, calls):
+    """ns per PLAYER_ACTION via the index and via a scan of `rooms`, for the newest connection"""
+    connection = next(reversed(server.connection_rooms))
+    data = {'action': 'hit'}
+    index_ns = min(timeit.repeat(lambda: server.handle_player_action(connection, data),
+                                 number=calls, repeat=3)) / calls * 1e9
+    scanned = GameServer.__new__(GameServer)  # Only .rooms is read
+    scanned.rooms = rooms
+    scan_calls = max(1, calls // 100)
+    scan_ns = min(timeit.repeat(lambda: scan_dispatch(scanned, connection, data),
+                                number=scan_calls, repeat=3)) / scan_calls * 1e9
+    return index_ns, scan_ns
+
+def cycle(server, n, abandon):
+    host, guest = NullConnection(), NullConnection()
+    server.process_message(host, CREATE_ROOM)
+    room_id = server.connection_rooms[host].room_id
+    server.handle_join_room(guest, {'room_id': room_id, 'player_name': 'Guest'})
+    server.handle_player_action(guest, {'action': 'hit'})
+    server.leave_room(guest)
+    if n % abandon:
+        server.leave_room(host)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cycles', type=int, default=1000000)
+    parser.add_argument('--abandon', type=int, default=10, help="every Nth host never leaves its room")
+    parser.add_argument('--tick-every', type=int, default=100, help="cycles between room updates")
+    parser.add_argument('--reports', type=int, default=10)
+    parser.add_argument('--calls', type=int, default=100000)
+    args = parser.parse_args()
+
+    server = GameServer(port=0)
+    server.socket.close()  # Never listens; handlers are called directly
+    expiry_cycles = ROOM_IDLE_TIMEOUT * SERVER_TICK_RATE
+    print(f"idle rooms expire after {ROOM_IDLE_TIMEOUT:.0f} s = {expiry_cycles:.0f} cycles; "
+          f"1 in {args.abandon} rooms is abandoned")
+    print(f"{'cycles':>9} {'rooms':>6} {'index':>6} {'objects':>8} {'blocks':>8} {'dispatch':>9} {'scan':>10} {'cycles/s':>9}")
+
+    report_every = args.cycles // args.reports
+    n = 0
+    for _ in range(args.reports):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # The server logs every idle room it closes
+            for _ in range(report_every):
+                n += 1
+                cycle(server, n, args.abandon)
+                if n % args.tick_every == 0:
+                    server.update_rooms(args.tick_every)
+        rate = report_every / (time.perf_counter() - start)
+        gc.collect()
+        objects, blocks = len(gc.get_objects()), sys.getallocatedblocks()
+        index_ns, scan_ns = dispatch_cost(server, server.rooms, args.calls)
+        print(f"{n:>9} {len(server.rooms):>6} {len(server.connection_rooms):>6} "
+              f"{objects:>8} {blocks:>8} {index_ns:>6.0f} ns {scan_ns / 1000:>6.1f} us {rate:>9.0f}")
+
+    # Without teardown every room created would still be there for the scan to walk through
+    leaked = {f"leaked-{n}": GameRoom(f"leaked-{n}") for n in range(min(args.cycles, 100000))}
+    leaked.update(server.rooms)
+    index_ns, scan_ns = dispatch_cost(server, leaked, args.calls)
+    print(f"scan over {len(leaked)} never-deleted rooms: {scan_ns / 1000:.0f} us per action "
+          f"({scan_ns / index_ns:,.0f}x the index)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Load benchmark: threaded GameServer vs AsyncGameServer
+
+Fills N rooms with 4 clients each, then lets the games run and reports
+connections/sec and tick-latency percentiles measured inside the server.
+
+Usage: python -m benchmarks.server_load --rooms 100 --duration 5
+"""
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import threading
+import time
+from network.protocol import FRAME_HEADER, json_frame, decode_json_frame
+from config.constants import SERVER_TICK_RATE
+
+def run_server(mode, port_queue, stop_event, stats_queue):
+    """Server process: start the server, wait for the benchmark, report stats"""
+    if mode == 'async':
+        from network.async_server import AsyncGameServer
+        server = AsyncGameServer(port=0)
+    else:
+        from network.server import GameServer
+        server = GameServer(port=0)
+
+    server_thread = threading.Thread(target=server.start)
+    server_thread.daemon = True
+    server_thread.start()
+    while not server.running:
+        time.sleep(0.01)
+    port_queue.put(server.port)
+
+    stop_event.wait()
+    rooms = list(server.rooms.values())
+    stats_queue.put({
+        'tick_stats': list(server.tick_stats),
+        'overruns': server.scheduler.overruns,
+        'dropped_steps': server.scheduler.dropped_steps,
+        'max_queue_depth': max((conn.outbound.max_depth for room in rooms for conn in room.players), default=0),
+        'evicted': sum(room.evicted for room in rooms),
+    })
+    server.stop()
+
+async def read_message(reader):
+    """Next frame; binary GAME_STATE frames come back as {'type': None}"""
+    kind, length = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    payload = await reader.readexactly(length)
+    return decode_json_frame(kind, payload) or {'type': None}
+
+async def send_message(writer, msg_type, data):
+    writer.write(json_frame({'type': msg_type, 'data': data}))
+    await writer.drain()
+
+async def drain(reader):
+    """Keep reading so the server never blocks on a full socket"""
+    try:
+        while await reader.read(65536):
+            pass
+    except ConnectionError:
+        pass
+
+async def fill_rooms(port, rooms):
+    """Create rooms and join 3 more players to each; return (writers, drain tasks)"""
+    writers = []
+    drain_tasks = []
+    for _ in range(rooms):
+        reader, writer = await asyncio.open_connection('localhost', port)
+        await send_message(writer, 'create_room', {'player_name': 'Host'})
+        msg = await read_message(reader)
+        while msg['type'] != 'room_created':
+            msg = await read_message(reader)
+        room_id = msg['data']['room_id']
+        writers.append(writer)
+        drain_tasks.append(asyncio.create_task(drain(reader)))
+
+        for i in range(3):
+            reader, writer = await asyncio.open_connection('localhost', port)
+            await send_message(writer, 'join_room', {'room_id': room_id, 'player_name': f'P{i}'})
+            writers.append(writer)
+            drain_tasks.append(asyncio.create_task(drain(reader)))
+    return writers, drain_tasks
+
+async def run_clients(port, rooms, duration, collect_stats):
+    start = time.perf_counter()
+    writers, drain_tasks = await fill_rooms(port, rooms)
+    connect_time = time.perf_counter() - start
+
+    await asyncio.sleep(duration)
+    # Collect server stats while every client is still connected
+    stats = await asyncio.get_running_loop().run_in_executor(None, collect_stats)
+
+    for writer in writers:
+        writer.close()
+    for task in drain_tasks:
+        task.cancel()
+    return len(writers) / connect_time, stats
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(len(values) * pct / 100))
+    return values[index]
+
+def benchmark(mode, rooms, duration):
+    port_queue = multiprocessing.Queue()
+    stats_queue = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    process = multiprocessing.Process(
+        target=run_server, args=(mode, port_queue, stop_event, stats_queue)
+    )
+    process.start()
+    port = port_queue.get()
+
+    def collect_stats():
+        stop_event.set()
+        return stats_queue.get()
+
+    conn_rate, stats = asyncio.run(run_clients(port, rooms, duration, collect_stats))
+    tick_stats = stats['tick_stats']
+    process.join(timeout=5)
+    if process.is_alive():
+        process.terminate()
+
+    # Tick latency = how late each tick started compared to the target rate
+    starts = [start for start, _ in tick_stats]
+    lateness = [(b - a - 1 / SERVER_TICK_RATE) * 1000 for a, b in zip(starts, starts[1:])]
+    durations = [d * 1000 for _, d in tick_stats]
+
+    print(f"[{mode}] rooms={rooms} clients={rooms * 4}")
+    print(f"  connections/sec: {conn_rate:.0f}")
+    print(f"  tick work ms    p50={percentile(durations, 50):.2f} "
+          f"p95={percentile(durations, 95):.2f} p99={percentile(durations, 99):.2f}")
+    print(f"  tick late ms    p50={percentile(lateness, 50):.2f} "
+          f"p95={percentile(lateness, 95):.2f} p99={percentile(lateness, 99):.2f}")
+    if durations:
+        print(f"  effective tick rate: {len(starts) / (starts[-1] - starts[0] or 1):.1f} Hz "
+              f"(mean work {statistics.mean(durations):.2f} ms)")
+    print(f"  scheduler overruns: {stats['overruns']} dropped steps: {stats['dropped_steps']}")
+    print(f"  max outbound queue depth: {stats['max_queue_depth']} evicted clients: {stats['evicted']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rooms', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--mode', choices=['threaded', 'async', 'both'], default='both')
+    args = parser.parse_args()
+
+    modes = ['threaded', 'async'] if args.mode == 'both' else [args.mode]
+    for mode in modes:
+        benchmark(mode, args.rooms, args.duration)
+
+if __name__ == "__main__":
+    main()
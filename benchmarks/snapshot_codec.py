@@ -0,0 +1,64 @@
+"""
+Micro-benchmark: JSON vs binary GAME_STATE encoding, keyframes vs deltas
+
+Usage: python -m benchmarks.snapshot_codec --iterations 20000
+"""
+import argparse
+import timeit
+from models.game import Game
+from network.server import GameRoom
+from network.protocol import *
+from network.snapshot import make_keyframe, diff_game_state
+
+def make_room():
+    room = GameRoom('BNCH')
+    room.game = Game()
+    room.game.update(1/60)
+    return room
+
+def make_snapshot():
+    return make_keyframe(make_room().serialize_game_state(), 1)
+
+def delta_sizes():
+    """Bytes per snapshot for a keyframe and for a delta while one player swings"""
+    room = make_room()
+    room.game.players[0].hit_ball(room.game.ball)
+    room.game.update(1/60)
+    baseline = room.serialize_game_state()
+    room.game.update(1/60)
+    room.time += 1/60
+    state = room.serialize_game_state()
+    keyframe = create_game_state_message(make_keyframe(state, 2))
+    delta = create_game_state_message(diff_game_state(baseline, state, 2, 1))
+    return {encoding: (len(keyframe.encode(encoding)), len(delta.encode(encoding)))
+            for encoding in SUPPORTED_ENCODINGS}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    message = create_game_state_message(make_snapshot())
+    results = {}
+    for encoding in SUPPORTED_ENCODINGS:
+        frame = message.encode(encoding)
+        encode_time = timeit.timeit(lambda: message.encode(encoding), number=args.iterations)
+        decode_time = timeit.timeit(lambda: decode_frames(frame), number=args.iterations)
+        results[encoding] = (len(frame), encode_time, decode_time)
+
+    for encoding, (size, encode_time, decode_time) in results.items():
+        print(f"{encoding:>6}: {size:4d} bytes/snapshot  "
+              f"encode {encode_time / args.iterations * 1e6:6.2f} us  "
+              f"decode {decode_time / args.iterations * 1e6:6.2f} us")
+
+    json_size, json_encode, json_decode = results[ENCODING_JSON]
+    binary_size, binary_encode, binary_decode = results[ENCODING_BINARY]
+    print(f"binary vs json: {json_size / binary_size:.1f}x smaller, "
+          f"{json_encode / binary_encode:.1f}x faster encode, "
+          f"{json_decode / binary_decode:.1f}x faster decode")
+
+    for encoding, (keyframe_size, delta_size) in delta_sizes().items():
+        print(f"{encoding:>6}: keyframe {keyframe_size:4d} bytes, delta (one player swinging) {delta_size:4d} bytes")
+
+if __name__ == "__main__":
+    main()
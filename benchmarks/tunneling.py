@@ -0,0 +1,69 @@
+"""
+Tunneling benchmark: swept vs end-of-tick collision checks at low tick rates
+
+Launches a fast ball from random points on the orbit at standing players and
+counts how often the right player (the first one in its path) is knocked off
+within one lap, with Game's swept check and with a check of only where the
+ball is at the end of each tick (the old behaviour).
+
+Usage: python -m benchmarks.tunneling --trials 500
+"""
+import argparse
+import math
+import random
+from models.game import Game
+from models.geometry import SEAT_ANGLES, BALL_ORBIT_RADIUS, COLLISION_ARC, angle_between
+
+class EndOfTickGame(Game):
+    """Game that only checks where the ball is after each tick"""
+    def check_collisions(self, start_angle=None, sweep=0.0):
+        super().check_collisions()
+
+def first_in_path(angle, direction):
+    """Seat the ball reaches first"""
+    return min(range(len(SEAT_ANGLES)), key=lambda seat: ((SEAT_ANGLES[seat] - angle) * direction) % (2 * math.pi))
+
+def trial(game_cls, tick_rate, speed, rng):
+    """True if the right player is knocked off before the ball completes a lap"""
+    game = game_cls(seed=rng.random())
+    ball = game.ball
+    ball.is_active = True
+    ball.speed = speed
+    ball.angle = rng.uniform(0, 2 * math.pi)
+    while any(angle_between(ball.angle, seat_angle) < COLLISION_ARC for seat_angle in SEAT_ANGLES):
+        ball.angle = rng.uniform(0, 2 * math.pi)  # Start clear of everyone, as after any real tick
+    ball.direction = rng.choice([-1, 1])
+    ball.x, ball.y = ball.get_position()
+    expected = first_in_path(ball.angle, ball.direction)
+
+    dt = 1.0 / tick_rate
+    lap_ticks = math.ceil(2 * math.pi * BALL_ORBIT_RADIUS / speed / dt) + 1
+    for _ in range(lap_ticks):
+        game.update(dt)
+        knocked = [player.id for player in game.players if player.state.value >= 4]  # FLYING_OFF or ELIMINATED
+        if knocked:
+            return knocked == [expected]
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--trials', type=int, default=500)
+    parser.add_argument('--rates', type=int, nargs='+', default=[60, 30, 20, 10])
+    parser.add_argument('--speeds', type=float, nargs='+', default=[500, 2000, 8000])
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'tick rate':>9} {'ball speed':>10} {'end-of-tick':>12} {'swept':>7}")
+    rows = []
+    for rate in args.rates:
+        for speed in args.speeds:
+            results = []
+            for game_cls in (EndOfTickGame, Game):
+                rng = random.Random(args.seed)
+                results.append(sum(trial(game_cls, rate, speed, rng) for _ in range(args.trials)) / args.trials)
+            rows.append((rate, speed, *results))
+    for rate, speed, end_of_tick, swept in rows:
+        print(f"{rate:>7}Hz {speed:>8.0f}px/s {end_of_tick:>11.0%} {swept:>7.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Loopback benchmark: GAME_STATE delivery over the UDP channel with simulated loss
+
+Runs a room of 4 clients against a local GameServer for each loss rate and
+reports how often snapshots arrive and the worst gap between two of them.
+Lost datagrams are never retransmitted, so a drop only costs the one
+snapshot instead of stalling every later one behind it.
+
+Usage: python -m benchmarks.udp_loss --loss 0 0.05 0.2 --duration 3
+"""
+import argparse
+import statistics
+import threading
+import time
+from network.server import GameServer
+from network.client import NetworkClient
+from network.protocol import *
+
+def run_room(udp, loss, duration):
+    """Play one room for duration seconds; returns per-client snapshot arrival times"""
+    server = GameServer(port=0, udp=udp, udp_loss=loss)
+    server_thread = threading.Thread(target=server.start)
+    server_thread.daemon = True
+    server_thread.start()
+    while not server.running:
+        time.sleep(0.01)
+
+    clients = [NetworkClient(port=server.port, encoding=ENCODING_BINARY, udp=udp, udp_loss=loss)
+               for _ in range(4)]
+    arrivals = [[] for _ in clients]
+    for client, times in zip(clients, arrivals):
+        client.connect()
+        client.set_message_handler(MessageType.GAME_STATE, lambda data, times=times: times.append(time.perf_counter()))
+
+    clients[0].create_room('Host')
+    while clients[0].room_id is None:
+        time.sleep(0.01)
+    for i, client in enumerate(clients[1:]):
+        client.join_room(clients[0].room_id, f'Bot {i + 1}')
+        time.sleep(0.05)
+
+    # Players keep dodging so actions also travel over the lossy channel
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        for client in clients:
+            client.send_action(ActionType.DODGE)
+        time.sleep(0.1)
+
+    channel = server.udp_channel
+    for client in clients:
+        client.disconnect()
+    server.stop()
+    return arrivals, channel
+
+def report(label, arrivals, duration):
+    gaps = [(b - a) * 1000 for times in arrivals for a, b in zip(times, times[1:])]
+    if not gaps:
+        print(f"{label:>12}: no snapshots received")
+        return
+    rate = statistics.mean(len(times) for times in arrivals) / duration
+    gaps.sort()
+    print(f"{label:>12}: {rate:6.1f} snapshots/s per client  "
+          f"gap p50 {gaps[len(gaps) // 2]:6.1f} ms  "
+          f"p99 {gaps[int(len(gaps) * 0.99)]:6.1f} ms  max {gaps[-1]:6.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--loss', type=float, nargs='+', default=[0.0, 0.05, 0.2])
+    parser.add_argument('--duration', type=float, default=3.0)
+    args = parser.parse_args()
+
+    arrivals, _ = run_room(False, 0.0, args.duration)
+    report('tcp', arrivals, args.duration)
+
+    for loss in args.loss:
+        arrivals, channel = run_room(True, loss, args.duration)
+        report(f'udp {loss:.0%} loss', arrivals, args.duration)
+        print(f"{'':>12}  server datagrams sent {channel.sent}, dropped {channel.lost}, "
+              f"received {channel.received}, stale {channel.stale}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Bots package
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Self-play farm - runs many headless games of scripted bots on all cores
+
+Each game is seeded from (--seed, game id), and the policies draw from the
+game's own generator, so any single game can be played again exactly. Games are sharded across a process pool in chunks; results are
+written to a JSON-lines file as chunks finish and aggregated on the fly.
+
+Usage: python -m bots.farm --games 100000 --lineup reactive random dodger idle --out results.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from models.game import Game
+from models.player_state import PlayerState
+from bots.policies import POLICIES
+from config.constants import *
+
+DEFAULT_MAX_TICKS = SERVER_TICK_RATE * 300  # Give up on games still running after 5 minutes
+
+def game_seed(seed, game_id):
+    """Per-game seed; the same (seed, game id) always plays the same game"""
+    return f"{seed}:{game_id}"
+
+def seating(lineup, game_id, rotate):
+    """Lineup slot sitting in each seat; rotating cancels out the advantage of a seat"""
+    shift = game_id % len(lineup) if rotate else 0
+    return [(seat - shift) % len(lineup) for seat in range(len(lineup))]
+
+def play_game(game_id, lineup, seed, max_ticks, rotate=True):
+    """Play one game to the end (or max_ticks) and return its result record"""
+    game = Game(seed=game_seed(seed, game_id))
+    rng = game.rng
+    seats = seating(lineup, game_id, rotate)
+    policies = [POLICIES[lineup[slot]] for slot in seats]
+    dt = 1.0 / SERVER_TICK_RATE
+
+    ticks = 0
+    while not game.game_over and ticks < max_ticks:
+        for player, policy in zip(game.players, policies):
+            if player.state == PlayerState.STANDING:
+                action = policy(game, player, rng)
+                if action:
+                    game.apply_action(player.id, action)
+        game.update(dt)
+        ticks += 1
+
+    winner = game.winner.id if game.winner else None
+    return {
+        'game': game_id,
+        'ticks': ticks,
+        'winner_seat': winner,
+        'winner_slot': seats[winner] if winner is not None else None,
+        'timeout': not game.game_over
+    }
+
+def play_chunk(args):
+    """Worker: play a range of game ids"""
+    start, end, lineup, seed, max_ticks, rotate = args
+    return [play_game(game_id, lineup, seed, max_ticks, rotate) for game_id in range(start, end)]
+
+def silence_worker():
+    # The models print on every hit and elimination
+    sys.stdout = open(os.devnull, 'w')
+
+def percentile(counts, fraction):
+    """Percentile of a Counter of values"""
+    target = fraction * sum(counts.values())
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen >= target:
+            return value
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--lineup', nargs=4, default=['reactive', 'random', 'dodger', 'idle'],
+                        choices=sorted(POLICIES), metavar='POLICY',
+                        help=f"policy for each of the 4 slots, from: {', '.join(sorted(POLICIES))}")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk', type=int, default=200, help='games per task sent to a worker')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-ticks', type=int, default=DEFAULT_MAX_TICKS)
+    parser.add_argument('--no-rotate', dest='rotate', action='store_false', help='keep each slot in the same seat')
+    parser.add_argument('--out', default='farm_results.jsonl')
+    args = parser.parse_args()
+
+    tasks = ((start, min(start + args.chunk, args.games), args.lineup, args.seed, args.max_ticks, args.rotate)
+             for start in range(0, args.games, args.chunk))
+    wins = Counter()
+    lengths = Counter()
+    timeouts = 0
+    done = 0
+
+    print(f"Playing {args.games} games of {' / '.join(args.lineup)} on {args.workers} workers")
+    start_time = time.perf_counter()
+    with open(args.out, 'w') as out, multiprocessing.Pool(args.workers, initializer=silence_worker) as pool:
+        for results in pool.imap_unordered(play_chunk, tasks):
+            for result in results:
+                out.write(json.dumps(result) + '\n')
+                wins[result['winner_slot']] += 1
+                lengths[result['ticks']] += 1
+                timeouts += result['timeout']
+            out.flush()
+            done += len(results)
+            if done % (args.chunk * 50) == 0:
+                print(f"  {done}/{args.games} games, {done / (time.perf_counter() - start_time):,.0f} games/s")
+    elapsed = time.perf_counter() - start_time
+
+    print(f"\nResults written to {args.out}")
+    for slot, name in enumerate(args.lineup):
+        print(f"  slot {slot} {name:>10}: {wins[slot] / args.games:6.1%} wins")
+    print(f"  {'no winner':>17}: {wins[None] / args.games:6.1%} ({timeouts} timed out)")
+
+    mean = sum(ticks * count for ticks, count in lengths.items()) / args.games
+    print(f"Match length: mean {mean / SERVER_TICK_RATE:.1f}s, "
+          f"p50 {percentile(lengths, 0.5) / SERVER_TICK_RATE:.1f}s, "
+          f"p95 {percentile(lengths, 0.95) / SERVER_TICK_RATE:.1f}s")
+    total_ticks = sum(ticks * count for ticks, count in lengths.items())
+    print(f"Throughput: {args.games / elapsed:,.0f} games/s, "
+          f"{args.games / elapsed / args.workers:,.0f} games/s/core, {total_ticks / elapsed:,.0f} ticks/s")
+
+if __name__ == "__main__":
+    main()
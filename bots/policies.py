@@ -0,0 +1,47 @@
+"""
+Scripted bot policies
+
+A policy looks at the game once per tick for one standing player and
+returns HIT, DODGE or None. It may only use `rng` for randomness, so a
+seeded game plays out the same way every time.
+"""
+import math
+from models.game import HIT, DODGE
+from config.constants import *
+
+def idle(game, player, rng):
+    """Never acts - a baseline to measure the others against"""
+    return None
+
+def random_policy(game, player, rng, hit_rate=0.02, dodge_rate=0.01):
+    """Presses buttons at random"""
+    roll = rng.random()
+    if roll < hit_rate:
+        return HIT
+    if roll < hit_rate + dodge_rate:
+        return DODGE
+    return None
+
+def reactive(game, player, rng):
+    """Hits as soon as the ball is in range; dodges it instead while the stick is cooling down"""
+    ball = game.ball
+    if not ball.is_active:
+        return None
+    if math.hypot(ball.x - player.x, ball.y - player.y) > HIT_RANGE:
+        return None
+    return HIT if player.hit_cooldown <= 0 else DODGE
+
+def dodger(game, player, rng):
+    """Never hits; dodges whenever the ball comes close"""
+    ball = game.ball
+    if ball.is_active and math.hypot(ball.x - player.x, ball.y - player.y) <= HIT_RANGE:
+        return DODGE
+    return None
+
+# Policies by name, so worker processes can be told which ones to run
+POLICIES = {
+    'idle': idle,
+    'random': random_policy,
+    'reactive': reactive,
+    'dodger': dodger
+}
@@ -34,4 +34,37 @@ BALL_RADIUS = 10  # Made slightly bigger
 BALL_SPEED = 100  # pixels per second
 BALL_ACCELERATION = 1.2  # speed multiplier when hit
 INITIAL_BALL_SPEED = 100  # reset speed when player eliminated
-BALL_SPAWN_DELAY = 3.0  # seconds to wait before ball starts moving
\ No newline at end of file
+BALL_SPAWN_DELAY = 3.0  # seconds to wait before ball starts moving
+
+# Debug settings
+DEBUG_MODEL = False  # print every HIT attempt and elimination; costs more than the game step itself
+
+# Server settings
+SERVER_TICK_RATE = 60  # fixed simulation steps per second
+MAX_CATCHUP_STEPS = 5  # most steps a late tick may run to catch up
+TICK_STATS_WINDOW = 600  # number of recent ticks kept for latency stats
+INPUT_STATS_WINDOW = 600  # recent actions per player kept for P2P input-to-apply latency stats
+ASYNC_SERVER_BACKLOG = 1024  # pending connections queued by the asyncio server
+SNAPSHOT_RATE = 30  # GAME_STATE snapshots sent per second; clients interpolate in between
+MAX_HIT_REWIND = 0.25  # seconds the server may rewind the ball to validate a HIT at the client's perceived time
+SNAPSHOT_HISTORY = 64  # snapshots kept as possible delta baselines (about 2 s at 30 Hz)
+KEYFRAME_INTERVAL = 60  # send a full snapshot every N snapshots regardless of acks
+MAX_OUTBOUND_MESSAGES = 64  # queued messages per client before it is evicted
+MAX_CLIENT_LAG = 2.0  # seconds a client may fall behind before it is evicted
+P2P_OUTBOUND_LIMIT = 262144  # bytes queued for a P2P peer before the host drops it
+RECV_BUFFER_SIZE = 4096  # bytes; each connection's reusable receive buffer, grown only for bigger frames
+MAX_FRAME_SIZE = 65536  # bytes; a peer announcing a bigger frame is disconnected
+UDP_MAX_DATAGRAM = 2048  # bytes; a keyframe snapshot fits comfortably
+UDP_HELLO_INTERVAL = 0.5  # seconds between client UDP registration attempts
+UDP_FALLBACK_TIMEOUT = 2.0  # seconds without datagrams before either side goes back to TCP for snapshots
+UDP_ACTION_REDUNDANCY = 3  # copies of each action sent over UDP to survive loss
+TIME_SYNC_INTERVAL = 1.0  # seconds between PINGs in each direction
+TIME_SYNC_BURST = 5  # PINGs sent 0.1 s apart after joining so the clock syncs quickly
+CLOCK_SYNC_WINDOW = 8  # recent round-trips the offset estimate picks the fastest from
+ROOM_IDLE_TIMEOUT = 300.0  # seconds a room without a running game may sit with no joins or actions before it is closed
+ROOM_FINISHED_TIMEOUT = 10.0  # seconds a room stays open after GAME_OVER so players see the result, then it is closed
+
+# Client rendering settings
+INTERPOLATION_DELAY = 0.1  # seconds clients render behind the server, enough to cover one lost snapshot
+SNAPSHOT_BUFFER_SIZE = 32  # snapshots kept for interpolation
+TEXT_CACHE_SIZE = 256  # rendered text surfaces GameRenderer keeps (countdown digits, RTT readouts, banners)
@@ -20,7 +20,7 @@ class OnlineGameController:
         self.clock = pygame.time.Clock()
         
         # Network client
-        self.client = NetworkClient(host, port)
+        self.client = NetworkClient(host, port, encoding=ENCODING_BINARY)
         
         # Renderers
         self.lobby_renderer = LobbyRenderer()
@@ -51,6 +51,7 @@ class OnlineGameController:
         self.client.set_message_handler(MessageType.ROOM_UPDATE, self.on_room_update)
         self.client.set_message_handler(MessageType.GAME_START, self.on_game_start)
         self.client.set_message_handler(MessageType.GAME_OVER, self.on_game_over)
+        self.client.set_message_handler(MessageType.ERROR, self.on_error)
     
     def on_room_created(self, data):
         """Handle room created message"""
@@ -83,6 +84,12 @@ class OnlineGameController:
         """Handle game start message"""
         self.current_view = "game"
     
+    def on_error(self, data):
+        """Handle error message, e.g. the server closing an idle room"""
+        self.current_view = "lobby"
+        self.players_in_room = 0
+        self.lobby_renderer.set_status(data.get('message', "Server error"), RED)
+    
     def on_game_over(self, data):
         """Handle game over message"""
         # Game over is handled in the game renderer
@@ -187,6 +194,8 @@ class OnlineGameController:
             # Update waiting room
             if self.current_view == "waiting":
                 self.update_waiting_room()
+            elif self.current_view == "game":
+                self.client.update_prediction(dt)
             
             # Render current view
             if self.current_view == "lobby":
@@ -202,8 +211,9 @@ class OnlineGameController:
             elif self.current_view == "game":
                 self.game_renderer.render_online_game(
                     self.screen, 
-                    self.client.game_state, 
-                    self.my_player_id
+                    self.client.render_state(), 
+                    self.my_player_id,
+                    self.client.latency_stats()
                 )
             
             # Update display
@@ -3,11 +3,16 @@ Ball model - represents the ball in the game
 """
 import math
 import random
-import pygame
+from .geometry import SPAWN_ANGLES, SPAWN_POSITIONS
 from config.constants import *
 
 class Ball:
-    def __init__(self):
+    # Fixed attribute set: no per-instance __dict__, and faster attribute access in the tick
+    __slots__ = ('rng', 'angle', 'speed', 'radius_offset', 'direction', 'spawn_timer', 'is_active',
+                 'x', 'y', 'countdown')
+    
+    def __init__(self, rng=None):
+        self.rng = rng or random  # random.Random for reproducible spawns; the global one by default
         self.angle = 0  # Current angle around the planet
         self.speed = BALL_SPEED  # Speed in pixels per second
         self.radius_offset = 35  # Distance from planet surface (reduced so ball is closer to players)
@@ -22,32 +27,18 @@ class Ball:
     def spawn_between_players(self):
         """Spawn ball at a random position between two players"""
         # Choose random pair of adjacent players (0-1, 1-2, 2-3, or 3-0)
-        player_pair = random.randint(0, 3)
-        
-        # Calculate angle between the two players
-        player1_angle = player_pair * (2 * math.pi / 4)
-        player2_angle = ((player_pair + 1) % 4) * (2 * math.pi / 4)
+        player_pair = self.rng.randint(0, 3)
         
         # Position ball exactly between the two players
-        self.angle = (player1_angle + player2_angle) / 2
-        
-        # If we're between player 3 and 0, handle the angle wrap-around
-        if player_pair == 3:
-            self.angle = (player1_angle + (player2_angle + 2 * math.pi)) / 2
-            if self.angle >= 2 * math.pi:
-                self.angle -= 2 * math.pi
+        self.angle = SPAWN_ANGLES[player_pair]
         
         # Choose random direction
-        self.direction = random.choice([-1, 1])
+        self.direction = self.rng.choice([-1, 1])
         
         self.is_active = False
         self.spawn_timer = BALL_SPAWN_DELAY
         self.countdown = BALL_SPAWN_DELAY
-        
-        # Update position
-        pos = self.get_position()
-        self.x = pos[0]
-        self.y = pos[1]
+        self.x, self.y = SPAWN_POSITIONS[player_pair]
         
     def get_position(self):
         """Get ball position"""
@@ -68,6 +59,37 @@ class Ball:
         """Reset ball speed to initial value"""
         self.speed = INITIAL_BALL_SPEED
     
+    def get_trajectory(self):
+        """Parameters that fix the ball's motion until the next hit, speed reset or respawn"""
+        return {
+            'angle': self.angle,
+            'speed': self.speed,
+            'direction': self.direction,
+            'is_active': self.is_active,
+            'spawn_timer': self.spawn_timer
+        }
+    
+    def set_trajectory(self, trajectory, elapsed=0):
+        """Place the ball where a trajectory puts it `elapsed` seconds later (no stepping needed)"""
+        self.speed = trajectory['speed']
+        self.direction = trajectory['direction']
+        self.is_active = trajectory['is_active']
+        self.angle = trajectory['angle']
+        self.spawn_timer = trajectory['spawn_timer']
+        
+        if self.is_active:
+            # Constant angular velocity between trajectory changes
+            radius = PLANET_RADIUS + self.radius_offset
+            self.angle = (self.angle + self.speed / radius * elapsed * self.direction) % (2 * math.pi)
+        else:
+            # Activation comes as its own trajectory change, so just count down
+            self.spawn_timer -= elapsed
+        self.countdown = max(0, self.spawn_timer)
+        
+        pos = self.get_position()
+        self.x = pos[0]
+        self.y = pos[1]
+    
     def update(self, dt):
         """Update ball position"""
         if not self.is_active:
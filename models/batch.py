@@ -0,0 +1,266 @@
+"""
+Batch game model - steps many games at once with NumPy
+
+BatchGame holds N games as arrays (one entry per game for the ball, one
+row of 4 per game for the players) and advances all of them together with
+the same rules as Ball.update, Player.update, Game.check_collisions and
+Game.check_game_over. HIT and DODGE follow Player.hit_ball and
+Player.start_dodge. Meant for bots and offline simulation; the game
+window and the servers keep using Game.
+"""
+import math
+import numpy as np
+from .player_state import PlayerState
+from .geometry import (NUM_SEATS, SEAT_ANGLES, BALL_ORBIT_RADIUS, SURFACE_POSITIONS, DODGE_POSITIONS,
+                       STICK_BASE_ANGLES, SPAWN_ANGLES, COLLISION_ARC, HIT_ARC)
+from config.constants import *
+
+STANDING = PlayerState.STANDING.value
+DODGING = PlayerState.DODGING.value
+SWINGING = PlayerState.SWINGING.value
+ELIMINATED = PlayerState.ELIMINATED.value
+FLYING_OFF = PlayerState.FLYING_OFF.value
+
+NUM_PLAYERS = NUM_SEATS
+DODGE_DURATION = 1.0  # Player.start_dodge
+TWO_PI = 2 * math.pi
+NO_CONTACT = np.inf
+MAX_SWING = math.radians(90)
+
+# Per-seat tables from models/geometry.py as arrays
+SURFACE_X, SURFACE_Y = np.array(SURFACE_POSITIONS).T
+UNDERGROUND_X, UNDERGROUND_Y = np.array(DODGE_POSITIONS).T
+STICK_BASE = np.array(STICK_BASE_ANGLES)
+SPAWN_ANGLE = np.array(SPAWN_ANGLES)
+
+def angle_between(ball_angle, seat):
+    """geometry.angle_between of each game's ball and a seat"""
+    d = np.abs(ball_angle - SEAT_ANGLES[seat]) % TWO_PI
+    return np.where(d > math.pi, TWO_PI - d, d)
+
+def sweep_contact(start_angle, sweep, direction, seat):
+    """geometry.sweep_contact against a seat for every game, NO_CONTACT where the ball stayed away"""
+    ahead = ((SEAT_ANGLES[seat] - start_angle) * direction) % TWO_PI
+    contact = np.where(ahead - COLLISION_ARC < sweep, np.maximum(0.0, ahead - COLLISION_ARC), NO_CONTACT)
+    return np.where((contact == NO_CONTACT) & (TWO_PI - ahead + sweep < COLLISION_ARC), 0.0, contact)
+
+class BatchGame:
+    """State of N games as NumPy arrays"""
+    def __init__(self, n, seed=None):
+        self.n = n
+        rng = np.random.default_rng(seed)
+
+        # Ball, spawned like Ball.spawn_between_players
+        pair = rng.integers(0, 4, n)
+        self.ball_angle = SPAWN_ANGLE[pair]
+        self.ball_speed = np.full(n, float(BALL_SPEED))
+        self.ball_direction = rng.choice([-1.0, 1.0], n)
+        self.ball_spawn_timer = np.full(n, BALL_SPAWN_DELAY)
+        self.ball_active = np.zeros(n, dtype=bool)
+
+        # Players, shape (n, 4)
+        shape = (n, NUM_PLAYERS)
+        self.state = np.full(shape, STANDING, dtype=np.int8)
+        self.x = np.tile(SURFACE_X, (n, 1))
+        self.y = np.tile(SURFACE_Y, (n, 1))
+        self.dodge_timer = np.zeros(shape)
+        self.swing_timer = np.zeros(shape)
+        self.hit_cooldown = np.zeros(shape)
+        self.stick_angle = np.zeros(shape)
+        self.swing_target_angle = np.zeros(shape)
+        self.swing_progress = np.zeros(shape)
+        self.fly_velocity_x = np.zeros(shape)
+        self.fly_velocity_y = np.zeros(shape)
+
+        self.game_over = np.zeros(n, dtype=bool)
+        self.winner = np.full(n, -1, dtype=np.int8)  # Player id, or -1 for none yet / no winner
+
+    @classmethod
+    def from_games(cls, games):
+        """Copy the state of existing Game objects into a batch"""
+        batch = cls(len(games))
+        for i, game in enumerate(games):
+            ball = game.ball
+            batch.ball_angle[i] = ball.angle
+            batch.ball_speed[i] = ball.speed
+            batch.ball_direction[i] = ball.direction
+            batch.ball_spawn_timer[i] = ball.spawn_timer
+            batch.ball_active[i] = ball.is_active
+            for j, player in enumerate(game.players):
+                batch.state[i, j] = player.state.value
+                batch.x[i, j] = player.x
+                batch.y[i, j] = player.y
+                batch.dodge_timer[i, j] = player.dodge_timer
+                batch.swing_timer[i, j] = player.swing_timer
+                batch.hit_cooldown[i, j] = player.hit_cooldown
+                batch.stick_angle[i, j] = player.stick_angle
+                batch.swing_target_angle[i, j] = player.swing_target_angle
+                batch.swing_progress[i, j] = player.swing_progress
+                batch.fly_velocity_x[i, j] = player.fly_velocity_x
+                batch.fly_velocity_y[i, j] = player.fly_velocity_y
+            batch.game_over[i] = game.game_over
+            batch.winner[i] = game.winner.id if game.winner else -1
+        return batch
+
+    def ball_position(self):
+        """Ball x, y for every game (Ball.get_position)"""
+        x = PLANET_CENTER[0] + BALL_ORBIT_RADIUS * np.cos(self.ball_angle)
+        y = PLANET_CENTER[1] + BALL_ORBIT_RADIUS * np.sin(self.ball_angle)
+        return x, y
+
+    def step(self, dt, hits=None, dodges=None):
+        """Apply this tick's actions, then advance every running game by dt
+
+        hits and dodges are optional (n, 4) bool arrays. Actions are applied
+        in player order, dodges before hits, like a server receiving them
+        between ticks.
+        """
+        running = ~self.game_over
+        if dodges is not None:
+            self.start_dodge(dodges & running[:, None])
+        if hits is not None:
+            self.hit_ball(hits & running[:, None])
+
+        # Where each ball starts and how far it travels, for swept collisions
+        start_angle = self.ball_angle.copy()
+        sweep = np.where(self.ball_active, self.ball_speed / BALL_ORBIT_RADIUS * dt, 0.0)
+        self.update_ball(dt, running)
+        self.update_players(dt, running)
+        self.check_collisions(running, start_angle, sweep)
+        self.check_game_over(running)
+
+    def start_dodge(self, mask):
+        """Player.start_dodge for every (game, player) in mask"""
+        dodge = mask & (self.state == STANDING)
+        self.state[dodge] = DODGING
+        self.dodge_timer[dodge] = DODGE_DURATION
+        self.x[dodge] = np.broadcast_to(UNDERGROUND_X, self.x.shape)[dodge]
+        self.y[dodge] = np.broadcast_to(UNDERGROUND_Y, self.y.shape)[dodge]
+
+    def hit_ball(self, mask):
+        """Player.hit_ball for every (game, player) in mask"""
+        ball_x, ball_y = self.ball_position()
+        # One player at a time: two hits in the same tick both reverse the ball
+        for j in range(NUM_PLAYERS):
+            swing = mask[:, j] & (self.state[:, j] == STANDING) & (self.hit_cooldown[:, j] <= 0)
+            if not swing.any():
+                continue
+
+            px = self.x[swing, j]
+            py = self.y[swing, j]
+            bx = ball_x[swing]
+            by = ball_y[swing]
+            can_affect_ball = self.ball_active[swing] & (angle_between(self.ball_angle[swing], j) <= HIT_ARC)
+
+            # Swing towards the ball, relative to the resting stick, limited to +/-90 degrees
+            target = np.arctan2(by - py, bx - px) - STICK_BASE[j]
+            target = np.where(target > math.pi, target - TWO_PI, target)
+            target = np.where(target < -math.pi, target + TWO_PI, target)
+            self.swing_target_angle[swing, j] = np.clip(target, -MAX_SWING, MAX_SWING)
+
+            self.state[swing, j] = SWINGING
+            self.swing_timer[swing, j] = SWING_DURATION
+            self.hit_cooldown[swing, j] = HIT_COOLDOWN
+
+            hit = np.flatnonzero(swing)[can_affect_ball]
+            self.ball_direction[hit] *= -1
+            self.ball_speed[hit] *= BALL_ACCELERATION
+
+    def update_ball(self, dt, running):
+        """Ball.update"""
+        waiting = running & ~self.ball_active
+        moving = running & self.ball_active
+
+        self.ball_spawn_timer[waiting] -= dt
+        self.ball_active[waiting & (self.ball_spawn_timer <= 0)] = True
+
+        angular_velocity = self.ball_speed[moving] / BALL_ORBIT_RADIUS
+        angle = self.ball_angle[moving] + angular_velocity * dt * self.ball_direction[moving]
+        angle = np.where(angle < 0, angle + TWO_PI, np.where(angle >= TWO_PI, angle - TWO_PI, angle))
+        self.ball_angle[moving] = angle
+
+    def update_players(self, dt, running):
+        """Player.update"""
+        running = running[:, None]
+        state = self.state.copy()  # Each player handles the state it started the tick in
+
+        cooling = running & (self.hit_cooldown > 0)
+        self.hit_cooldown[cooling] -= dt
+
+        dodging = running & (state == DODGING)
+        self.dodge_timer[dodging] -= dt
+        stand_up = dodging & (self.dodge_timer <= 0)
+        self.state[stand_up] = STANDING
+        self.x[stand_up] = np.broadcast_to(SURFACE_X, self.x.shape)[stand_up]
+        self.y[stand_up] = np.broadcast_to(SURFACE_Y, self.y.shape)[stand_up]
+
+        swinging = running & (state == SWINGING)
+        self.swing_timer[swinging] -= dt
+        progress = 1 - (self.swing_timer[swinging] / SWING_DURATION)
+        self.swing_progress[swinging] = progress
+        self.stick_angle[swinging] = np.degrees(self.swing_target_angle[swinging] * np.sin(progress * math.pi))
+        swing_done = swinging & (self.swing_timer <= 0)
+        self.state[swing_done] = STANDING
+        self.stick_angle[swing_done] = 0
+        self.swing_target_angle[swing_done] = 0
+        self.swing_progress[swing_done] = 0
+
+        flying = running & (state == FLYING_OFF)
+        self.x[flying] += self.fly_velocity_x[flying] * dt
+        self.y[flying] += self.fly_velocity_y[flying] * dt
+        self.fly_velocity_y[flying] += 400 * dt  # Gravity
+        off_screen = flying & ((self.x < -100) | (self.x > SCREEN_WIDTH + 100) | (self.y > SCREEN_HEIGHT + 100))
+        self.state[off_screen] = ELIMINATED
+
+    def check_collisions(self, running, start_angle, sweep):
+        """Game.check_collisions: the first player the ball reached along its arc is knocked off"""
+        checked = running & self.ball_active
+        if not checked.any():
+            return
+
+        # Earliest contact per game; ties go to the lower player id, as in the loop over players
+        first_contact = np.full(self.n, NO_CONTACT)
+        first = np.full(self.n, -1)
+        for j in range(NUM_PLAYERS):
+            state = self.state[:, j]
+            exposed = checked & (state != ELIMINATED) & (state != DODGING) & (state != FLYING_OFF)
+            contact = sweep_contact(start_angle, sweep, self.ball_direction, j)
+            earlier = exposed & (contact < first_contact)
+            first_contact[earlier] = contact[earlier]
+            first[earlier] = j
+        if (first < 0).all():
+            return
+        ball_x, ball_y = self.ball_position()
+
+        for j in range(NUM_PLAYERS):
+            hit = first == j
+            if not hit.any():
+                continue
+
+            # Touching now: fly away from the ball; passed through: from the contact point
+            touching = angle_between(self.ball_angle[hit], j) < COLLISION_ARC
+            contact_angle = start_angle[hit] + self.ball_direction[hit] * first_contact[hit]
+            bx = np.where(touching, ball_x[hit], PLANET_CENTER[0] + BALL_ORBIT_RADIUS * np.cos(contact_angle))
+            by = np.where(touching, ball_y[hit], PLANET_CENTER[1] + BALL_ORBIT_RADIUS * np.sin(contact_angle))
+
+            # Player.eliminate: fly away from the ball
+            dx = self.x[hit, j] - bx
+            dy = self.y[hit, j] - by
+            length = np.sqrt(dx*dx + dy*dy)
+            nonzero = length > 0
+            dx = np.where(nonzero, dx / np.where(nonzero, length, 1), dx)
+            dy = np.where(nonzero, dy / np.where(nonzero, length, 1), dy)
+            self.fly_velocity_x[hit, j] = dx * 300
+            self.fly_velocity_y[hit, j] = dy * 300 - 150
+            self.state[hit, j] = FLYING_OFF
+
+            self.ball_speed[hit] = INITIAL_BALL_SPEED
+
+    def check_game_over(self, running):
+        """Game.check_game_over"""
+        alive = self.state != ELIMINATED
+        remaining = alive.sum(axis=1)
+        over = running & (remaining <= 1)
+        self.game_over[over] = True
+        won = over & (remaining == 1)
+        self.winner[won] = alive[won].argmax(axis=1)
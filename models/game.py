@@ -2,15 +2,29 @@
 Game model - main game logic and state management
 """
 import math
+import random
 from .player import Player
 from .ball import Ball
 from .player_state import PlayerState
+from .geometry import BALL_ORBIT_RADIUS, COLLISION_ARC, angle_between, orbit_position, sweep_contact
 from config.constants import *
 
+# Player actions, same values as ActionType in network/protocol.py
+HIT = "hit"
+DODGE = "dodge"
+
 class Game:
-    def __init__(self):
+    def __init__(self, rng=None, seed=None):
+        if rng is None:
+            if seed is None:
+                seed = random.getrandbits(63)  # A fresh game, but one that can be replayed
+            rng = random.Random(seed)
+        self.seed = seed  # None when the caller passed its own generator
+        self.rng = rng  # All of the game's randomness comes from here
+        self.tick = 0  # Updates run so far; the input log refers to them
+        self.recorder = None  # Receives every applied action, e.g. a ReplayWriter
         self.players = []
-        self.ball = Ball()
+        self.ball = Ball(rng)
         self.game_over = False
         self.winner = None
         
@@ -20,27 +34,38 @@ class Game:
             player = Player(i, angle, PLAYER_COLORS[i])
             self.players.append(player)
     
-    def check_collisions(self):
-        """Check for ball-player collisions"""
+    def check_collisions(self, start_angle=None, sweep=0.0):
+        """Check for ball-player collisions along the arc the ball swept this tick"""
         if not self.ball.is_active:
             return  # No collisions during spawn delay
             
-        ball_pos = self.ball.get_position()
+        ball = self.ball
+        if start_angle is None:
+            start_angle = ball.angle  # Just where the ball is now
         
+        # Players left here stand on the surface circle and the ball is on its orbit,
+        # so angles around the planet decide collisions - no distance needed.
+        # The first player the ball reached on its way is the one it knocks off.
+        first = None
         for player in self.players:
             if player.state in [PlayerState.ELIMINATED, PlayerState.DODGING, PlayerState.FLYING_OFF]:
                 continue
-                
-            # Use current player position (x, y) instead of get_position
-            distance = math.sqrt((ball_pos[0] - player.x)**2 + (ball_pos[1] - player.y)**2)
-            
-            if distance < BALL_RADIUS + PLAYER_RADIUS:
-                # Start elimination animation
-                player.eliminate(ball_pos[0], ball_pos[1])
-                # Reset ball speed when player is eliminated (but keep direction and position)
-                self.ball.reset_speed()
-                print(f"Player {player.id + 1} eliminated!")
-                break  # Only eliminate one player per frame
+            contact = sweep_contact(start_angle, sweep, ball.direction, player.angle)
+            if contact is not None and (first is None or contact < first_contact):
+                first, first_contact = player, contact
+        
+        if first:
+            if angle_between(ball.angle, first.angle) < COLLISION_ARC:
+                ball_x, ball_y = ball.x, ball.y
+            else:
+                # The ball passed through the player during the tick: fly away from the contact point
+                ball_x, ball_y = orbit_position(start_angle + ball.direction * first_contact)
+            # Start elimination animation
+            first.eliminate(ball_x, ball_y)
+            # Reset ball speed when player is eliminated (but keep direction and position)
+            ball.reset_speed()
+            if DEBUG_MODEL:
+                print(f"Player {first.id + 1} eliminated!")  # Only one player per frame
     
     def check_game_over(self):
         """Check if game is over"""
@@ -50,15 +75,41 @@ class Game:
             if len(active_players) == 1:
                 self.winner = active_players[0]
     
+    def apply_action(self, player_id, action, seen_ball=None):
+        """Apply a player's HIT or DODGE before the next update, logging it as (tick, player_id, action)"""
+        if self.recorder:
+            self.recorder.record(self.tick, player_id, action, seen_ball)
+        player = self.players[player_id]
+        if action == HIT:
+            return player.hit_ball(self.ball, seen_ball)
+        elif action == DODGE:
+            player.start_dodge()
+        return False
+    
     def update(self, dt):
         """Update game state"""
         if not self.game_over:
+            self.tick += 1
+            # Where the ball starts and how far it travels, for swept collisions
+            start_angle = self.ball.angle
+            sweep = self.ball.speed / BALL_ORBIT_RADIUS * dt if self.ball.is_active else 0.0
             self.ball.update(dt)
             for player in self.players:
                 player.update(dt)
-            self.check_collisions()
+            self.check_collisions(start_angle, sweep)
             self.check_game_over()
     
     def reset(self):
-        """Reset the game to initial state"""
-        self.__init__()
\ No newline at end of file
+        """Reset the game to initial state
+
+        The next game's randomness comes from this one's generator, so a seeded
+        session plays out the same after a reset too, and a seeded game gets a
+        new seed drawn from it. A recorder is closed with the finished game's end
+        line and not carried over: attach a new ReplayWriter to record the next game.
+        """
+        if self.recorder:
+            self.recorder.close(self)
+        if self.seed is None:
+            self.__init__(self.rng)
+        else:
+            self.__init__(seed=self.rng.getrandbits(63))
\ No newline at end of file
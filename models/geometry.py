@@ -0,0 +1,85 @@
+"""
+Fixed geometry of the planet - per-seat positions and directions
+
+Players never move around the planet and the ball only spawns between two
+seats, so every position that depends on a seat angle is computed once here
+from config/constants.py instead of with cos/sin on every call. Tables are
+indexed by seat (= player id). Each value uses the same expression the
+models used before, so results are bit-identical.
+"""
+import math
+from config.constants import *
+
+NUM_SEATS = 4
+SEAT_ANGLES = tuple(i * (2 * math.pi / 4) for i in range(NUM_SEATS))  # Angle around the planet per seat
+
+SURFACE_RADIUS = PLANET_RADIUS + PLAYER_RADIUS + 5  # Distance of a standing player from the center
+DODGE_RADIUS = PLANET_RADIUS - PLAYER_RADIUS//2  # Distance of a dodging (underground) player
+BALL_ORBIT_RADIUS = PLANET_RADIUS + 35  # Ball.radius_offset
+
+TWO_PI = 2 * math.pi
+
+def _around_planet(radius, angle):
+    return (PLANET_CENTER[0] + radius * math.cos(angle), PLANET_CENTER[1] + radius * math.sin(angle))
+
+def orbit_position(angle):
+    """Point on the ball's orbit at `angle`"""
+    return _around_planet(BALL_ORBIT_RADIUS, angle)
+
+SURFACE_POSITIONS = tuple(_around_planet(SURFACE_RADIUS, angle) for angle in SEAT_ANGLES)
+DODGE_POSITIONS = tuple(_around_planet(DODGE_RADIUS, angle) for angle in SEAT_ANGLES)
+
+# Resting stick direction per seat: right, up, left, down (player 1 bottom, 2 left, 3 top, 4 right)
+STICK_BASE_ANGLES = (0, math.pi/2, math.pi, -math.pi/2)
+STICK_BASE_VECTORS = tuple((math.cos(angle), math.sin(angle)) for angle in STICK_BASE_ANGLES)
+
+def _spawn_angle(pair):
+    """Halfway between seat `pair` and the next one, as Ball.spawn_between_players computed it"""
+    angle1 = SEAT_ANGLES[pair]
+    angle2 = SEAT_ANGLES[(pair + 1) % NUM_SEATS]
+    if pair == NUM_SEATS - 1:
+        # Between the last seat and seat 0: wrap around
+        angle = (angle1 + (angle2 + 2 * math.pi)) / 2
+        return angle - 2 * math.pi if angle >= 2 * math.pi else angle
+    return (angle1 + angle2) / 2
+
+SPAWN_ANGLES = tuple(_spawn_angle(pair) for pair in range(NUM_SEATS))  # Ball spawn angle per seat pair
+SPAWN_POSITIONS = tuple(_around_planet(BALL_ORBIT_RADIUS, angle) for angle in SPAWN_ANGLES)
+
+HIT_RANGE_SQ = HIT_RANGE ** 2  # Range checks compare squared distances, no sqrt
+
+def _orbit_arc(distance):
+    """Largest angle between the ball's orbit and a standing player that keeps them within `distance`"""
+    # Law of cosines: both sit on circles around PLANET_CENTER
+    cos_arc = (BALL_ORBIT_RADIUS**2 + SURFACE_RADIUS**2 - distance**2) / (2 * BALL_ORBIT_RADIUS * SURFACE_RADIUS)
+    return math.acos(max(-1.0, min(1.0, cos_arc)))
+
+COLLISION_ARC = _orbit_arc(BALL_RADIUS + PLAYER_RADIUS)  # Ball touches a standing player
+HIT_ARC = _orbit_arc(HIT_RANGE)  # Ball is within a standing player's HIT_RANGE
+
+def angle_between(a, b):
+    """Angle between two directions around the planet, in [0, pi]"""
+    d = abs(a - b) % TWO_PI
+    return TWO_PI - d if d > math.pi else d
+
+def sweep_contact(start_angle, sweep, direction, target_angle, arc=COLLISION_ARC):
+    """How far along its path the ball first came within `arc` of target_angle, or None
+
+    The ball moved `sweep` radians (possibly more than a full turn) from start_angle
+    in `direction` (1 or -1) during the tick. Checking the whole arc instead of
+    only where it ended up means a fast ball can't pass through a player between
+    two ticks.
+    """
+    ahead = ((target_angle - start_angle) * direction) % TWO_PI  # Target's distance ahead of the start
+    if ahead - arc < sweep:
+        return max(0.0, ahead - arc)
+    if TWO_PI - ahead + sweep < arc:
+        return 0.0  # Just behind the start, and still close at the end
+    return None
+
+def stick_direction(seat, stick_angle):
+    """Unit vector of a stick swung `stick_angle` degrees from its resting direction"""
+    if stick_angle == 0:
+        return STICK_BASE_VECTORS[seat]
+    angle = STICK_BASE_ANGLES[seat] + math.radians(stick_angle)
+    return (math.cos(angle), math.sin(angle))
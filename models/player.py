@@ -3,9 +3,15 @@ Player model - represents a player in the game
 """
 import math
 from .player_state import PlayerState
+from .geometry import SURFACE_POSITIONS, DODGE_POSITIONS, STICK_BASE_ANGLES, HIT_RANGE_SQ, HIT_ARC, angle_between
 from config.constants import *
 
 class Player:
+    # Fixed attribute set: no per-instance __dict__, and faster attribute access in the tick
+    __slots__ = ('id', 'angle', 'color', 'state', 'dodge_timer', 'swing_timer', 'hit_cooldown',
+                 'stick_angle', 'swing_target_angle', 'swing_progress', 'fly_velocity_x',
+                 'fly_velocity_y', 'x', 'y')
+    
     def __init__(self, player_id, angle, color):
         self.id = player_id
         self.angle = angle  # Angle around the planet (in radians)
@@ -30,29 +36,22 @@ class Player:
         
         if self.state == PlayerState.DODGING:
             # Underground position (closer to planet center)
-            self.x = PLANET_CENTER[0] + (PLANET_RADIUS - PLAYER_RADIUS//2) * math.cos(self.angle)
-            self.y = PLANET_CENTER[1] + (PLANET_RADIUS - PLAYER_RADIUS//2) * math.sin(self.angle)
+            self.x, self.y = DODGE_POSITIONS[self.id]
         else:
             # Surface position (further from planet center to accommodate larger players)
-            self.x = PLANET_CENTER[0] + (PLANET_RADIUS + PLAYER_RADIUS + 5) * math.cos(self.angle)
-            self.y = PLANET_CENTER[1] + (PLANET_RADIUS + PLAYER_RADIUS + 5) * math.sin(self.angle)
+            self.x, self.y = SURFACE_POSITIONS[self.id]
         
     def get_position(self):
         """Get player position on the planet surface"""
-        x = PLANET_CENTER[0] + (PLANET_RADIUS + PLAYER_RADIUS + 5) * math.cos(self.angle)
-        y = PLANET_CENTER[1] + (PLANET_RADIUS + PLAYER_RADIUS + 5) * math.sin(self.angle)
-        return (x, y)
+        return SURFACE_POSITIONS[self.id]
     
     def get_dodge_position(self):
         """Get player position when dodging (underground)"""
-        x = PLANET_CENTER[0] + (PLANET_RADIUS - PLAYER_RADIUS//2) * math.cos(self.angle)
-        y = PLANET_CENTER[1] + (PLANET_RADIUS - PLAYER_RADIUS//2) * math.sin(self.angle)
-        return (x, y)
+        return DODGE_POSITIONS[self.id]
     
     def can_hit(self, ball_x, ball_y):
         """Check if ball is within hitting range"""
-        distance = math.sqrt((self.x - ball_x)**2 + (self.y - ball_y)**2)
-        return distance <= HIT_RANGE
+        return (self.x - ball_x)**2 + (self.y - ball_y)**2 <= HIT_RANGE_SQ
     
     def start_dodge(self):
         """Start dodging for a short duration"""
@@ -61,36 +60,32 @@ class Player:
             self.dodge_timer = 1.0  # Dodge for 1 second
             self.update_position()
     
-    def hit_ball(self, ball):
+    def hit_ball(self, ball, seen_ball=None):
         """Hit the ball, reversing its direction and increasing speed"""
-        # Debug: check conditions
-        print(f"Player {self.id} trying to hit: state={self.state}, cooldown={self.hit_cooldown:.2f}")
+        if DEBUG_MODEL:
+            print(f"Player {self.id} trying to hit: state={self.state}, cooldown={self.hit_cooldown:.2f}")
         
         if self.state == PlayerState.STANDING and self.hit_cooldown <= 0:
-            # Check if ball can be hit before starting swing
-            ball_pos = ball.get_position()
-            distance = math.sqrt((self.x - ball_pos[0])**2 + (self.y - ball_pos[1])**2)
-            can_affect_ball = ball.is_active and distance <= HIT_RANGE
-            
-            print(f"  Ball distance: {distance:.1f}, HIT_RANGE: {HIT_RANGE}, is_active: {ball.is_active}, can_affect: {can_affect_ball}")
+            # Check if ball can be hit before starting swing; seen_ball is an optional
+            # (x, y, is_active) of where the player saw it, for lag-compensated hits
+            if seen_ball:
+                ball_x, ball_y, ball_active = seen_ball
+                in_range = self.can_hit(ball_x, ball_y)
+            else:
+                ball_x, ball_y, ball_active = ball.x, ball.y, ball.is_active
+                # A standing player and the ball are on circles around the planet: compare angles
+                in_range = angle_between(ball.angle, self.angle) <= HIT_ARC
+            can_affect_ball = ball_active and in_range
+            if DEBUG_MODEL:
+                print(f"  Ball in range: {in_range}, HIT_RANGE: {HIT_RANGE}, is_active: {ball_active}, can_affect: {can_affect_ball}")
             
             # Calculate angle towards the ball for swing animation
-            dx = ball_pos[0] - self.x
-            dy = ball_pos[1] - self.y
+            dx = ball_x - self.x
+            dy = ball_y - self.y
             ball_angle = math.atan2(dy, dx)
             
-            # Calculate base angle for each player's stick orientation
-            if self.id == 0:  # Player 1 (bottom) - horizontal, pointing right
-                base_angle = 0  # 0 degrees (right)
-            elif self.id == 1:  # Player 2 (left) - vertical, pointing up
-                base_angle = math.pi/2  # 90 degrees (up)
-            elif self.id == 2:  # Player 3 (top) - horizontal, pointing left
-                base_angle = math.pi  # 180 degrees (left)
-            elif self.id == 3:  # Player 4 (right) - vertical, pointing down
-                base_angle = -math.pi/2  # -90 degrees (down)
-            
             # Calculate relative angle from player's base stick position
-            self.swing_target_angle = ball_angle - base_angle
+            self.swing_target_angle = ball_angle - STICK_BASE_ANGLES[self.id]
             
             # Normalize angle to reasonable swing range (-90 to +90 degrees)
             while self.swing_target_angle > math.pi:
@@ -111,12 +106,13 @@ class Player:
             if can_affect_ball:
                 ball.reverse_direction()
                 ball.increase_speed()
-                print(f"  BALL HIT! New speed: {ball.speed:.1f}")
+                if DEBUG_MODEL:
+                    print(f"  BALL HIT! New speed: {ball.speed:.1f}")
                 return True
-            else:
+            elif DEBUG_MODEL:
                 print(f"  Swing animation only (ball not in range)")
             return False
-        else:
+        elif DEBUG_MODEL:
             print(f"  Cannot hit: wrong state or cooldown")
         return False
     
@@ -0,0 +1,110 @@
+"""
+Replay files - a game's seed and input log, re-simulated offline
+
+A Game is fully determined by its seed, its fixed step and the actions
+applied between steps, so that is all a replay stores. The file is JSON
+lines (gzip-compressed when the name ends in .gz), written as the game is
+played:
+
+    {"version": 1, "seed": ..., "dt": ..., ...}      header, plus any metadata
+    [tick, player_id, action]                        one line per input
+    [tick, player_id, action, x, y, is_active]       lag-compensated HIT (where the player saw the ball)
+    {"end": tick, "winner": id, "state": [...]}      written when the recording is closed
+
+The end line's state lets a replay check that it reproduced the game bit for bit.
+"""
+import gzip
+import json
+from .game import Game
+from .simulation import simulate
+from config.constants import *
+
+REPLAY_VERSION = 1
+
+def open_replay(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't')
+    return open(path, mode)
+
+def state_digest(game):
+    """Every float and state that a replay must reproduce exactly"""
+    ball = game.ball
+    digest = [ball.angle, ball.speed, ball.direction, ball.spawn_timer, ball.is_active]
+    for player in game.players:
+        digest += [player.state.value, player.x, player.y, player.hit_cooldown, player.dodge_timer, player.swing_timer]
+    return digest
+
+class ReplayWriter:
+    """Streams a game's seed and inputs to a replay file as they are applied"""
+    def __init__(self, path, game, dt=1.0 / SERVER_TICK_RATE, **metadata):
+        if game.seed is None:
+            raise ValueError("Only games created with a seed can be recorded")
+        self.path = path
+        self.file = open_replay(path, 'w')
+        self.inputs = 0
+        self.write({'version': REPLAY_VERSION, 'seed': game.seed, 'dt': dt, **metadata})
+        game.recorder = self
+
+    def write(self, entry):
+        self.file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+    def record(self, tick, player_id, action, seen_ball=None):
+        entry = [tick, player_id, action]
+        if seen_ball:
+            entry += list(seen_ball)
+        self.write(entry)
+        self.inputs += 1
+
+    def close(self, game):
+        """Write the end line and close the file"""
+        if self.file.closed:
+            return
+        game.recorder = None
+        self.write({
+            'end': game.tick,
+            'winner': game.winner.id if game.winner else None,
+            'state': state_digest(game)
+        })
+        self.file.close()
+
+def read_replay(path):
+    """(header, inputs, end) of a replay file; inputs is a generator, end is filled in once it's exhausted"""
+    file = open_replay(path, 'r')
+    header = json.loads(file.readline())
+    if header.get('version') != REPLAY_VERSION:
+        file.close()
+        raise ValueError(f"Unsupported replay version {header.get('version')}")
+    end = {}
+
+    def inputs():
+        with file:
+            for line in file:
+                entry = json.loads(line)
+                if isinstance(entry, dict):
+                    end.update(entry)
+                    return
+                tick, player_id, action = entry[:3]
+                seen_ball = tuple(entry[3:]) if len(entry) > 3 else None
+                yield tick, player_id, action, seen_ball
+
+    return header, inputs(), end
+
+def replay(path):
+    """Re-simulate a replay file; returns (game, end line, or {} for a recording that was cut off)"""
+    return replay_inputs(*read_replay(path))
+
+def replay_inputs(header, inputs, end):
+    """Re-simulate what read_replay returned, for callers that also want the header; same result as replay()"""
+    game = Game(seed=header['seed'])
+    dt = header['dt']
+    for tick, player_id, action, seen_ball in inputs:
+        simulate(tick - game.tick, (), game, dt)  # Catch up to the input's tick
+        game.apply_action(player_id, action, seen_ball)
+    if 'end' in end:
+        simulate(end['end'] - game.tick, (), game, dt)
+    return game, end
+
+def verify(path):
+    """True if replaying the file reproduces the recorded end state exactly"""
+    game, end = replay(path)
+    return bool(end) and game.tick == end['end'] and state_digest(game) == end['state']
@@ -0,0 +1,29 @@
+"""
+Headless simulation - runs Game in fixed steps as fast as the CPU allows
+
+Nothing here (or in the models it uses) imports pygame, so servers, bots
+and simulation workers start without SDL.
+"""
+from .game import Game, HIT, DODGE
+from config.constants import *
+
+def simulate(n_ticks, action_script=(), game=None, dt=1.0 / SERVER_TICK_RATE):
+    """Run up to n_ticks fixed steps of `game` (a new Game by default); returns (game, ticks run)
+
+    action_script yields (tick, player_id, action) in order of Game.tick, optionally
+    with a seen_ball for lag-compensated hits (see Game.apply_action); each action
+    is applied just before that tick's step. Stops early once the game is over.
+    """
+    if game is None:
+        game = Game()
+    script = iter(action_script)
+    pending = next(script, None)
+    ticks = 0
+
+    while ticks < n_ticks and not game.game_over:
+        while pending is not None and pending[0] <= game.tick:
+            game.apply_action(*pending[1:])
+            pending = next(script, None)
+        game.update(dt)
+        ticks += 1
+    return game, ticks
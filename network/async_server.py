@@ -0,0 +1,102 @@
+"""
+Asyncio game server for Hit & Dodge multiplayer
+
+Runs every connection and every GameRoom on a single event loop instead of
+one OS thread per client, so one process can host thousands of rooms.
+"""
+import asyncio
+import time
+from network.server import GameServer
+from network.protocol import *
+from network.connection import AsyncConnection
+from network.udp import UdpChannel
+from config.constants import *
+
+class ServerDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, addr):
+        self.server.handle_datagram(data, addr)
+
+class AsyncGameServer(GameServer):
+    def __init__(self, host='localhost', port=12345, udp=False, udp_loss=0.0, replay_dir=None):
+        self.init_state(host, port, udp, udp_loss, replay_dir)
+        self.server = None
+        self.loop = None
+
+    def start(self):
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            print("Server shutting down...")
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(
+            self.handle_client, self.host, self.port,
+            reuse_address=True, backlog=ASYNC_SERVER_BACKLOG
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+
+        udp_transport = None
+        if self.udp_enabled:
+            udp_transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: ServerDatagramProtocol(self), local_addr=(self.host, self.port)
+            )
+            self.udp_channel = UdpChannel(udp_transport, self.udp_loss)
+        self.running = True
+
+        print(f"Async game server started on {self.host}:{self.port}")
+
+        update_task = asyncio.create_task(self.game_update_loop())
+        try:
+            await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.running = False
+            update_task.cancel()
+            if udp_transport:
+                udp_transport.close()
+            self.close_replays()
+
+    def stop(self):
+        """Stop the server (safe to call from any thread)"""
+        self.running = False
+        if self.loop and self.server:
+            self.loop.call_soon_threadsafe(self.server.close)
+
+    async def game_update_loop(self):
+        """Update all active games at a fixed tick rate"""
+        while self.running:
+            tick_start = time.perf_counter()
+            steps = self.scheduler.due_steps(tick_start)
+            if steps:
+                self.update_rooms(steps)
+                self.tick_stats.append((tick_start, time.perf_counter() - tick_start))
+            await asyncio.sleep(self.scheduler.time_until_next_tick(time.perf_counter()))
+
+    async def handle_client(self, reader, writer):
+        connection = AsyncConnection(reader, writer)
+        address = connection.address
+        print(f"Client connected from {address}")
+        decoder = FrameDecoder()
+        try:
+            while self.running:
+                data = await reader.read(RECV_BUFFER_SIZE)
+                if not data:
+                    break
+
+                for message in decoder.feed(data):
+                    self.process_message(connection, message)
+        except Exception as e:
+            print(f"Error handling client {address}: {e}")
+        finally:
+            # Remove client from any room
+            self.forget_connection(connection)
+            connection.close()
+
+if __name__ == "__main__":
+    server = AsyncGameServer()
+    server.start()
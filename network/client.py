@@ -5,21 +5,48 @@ import socket
 import threading
 import time
 from network.protocol import *
+from network.snapshot import apply_snapshot_delta
+from network.udp import UdpChannel
+from network.interpolation import SnapshotBuffer
+from network.prediction import PlayerPredictor
+from network.trajectory import BallTrajectory
+from network.clock import ClockSync
+from config.constants import *
 
 class NetworkClient:
-    def __init__(self, host='localhost', port=12345):
+    def __init__(self, host='localhost', port=12345, encoding=ENCODING_JSON, udp=False, udp_loss=0.0):
         self.host = host
         self.port = port
+        self.encoding = encoding  # Snapshot encoding requested at join time
+        self.use_udp = udp  # Use the server's UDP channel for snapshots/actions if offered
+        self.udp_loss = udp_loss  # Simulated outgoing datagram loss, for testing
+        self.udp_socket = None
+        self.udp_channel = None
+        self.udp_address = None
+        self.udp_token = None
+        self.udp_active = False  # True while datagrams from the server keep arriving
+        self.udp_heard = 0.0  # monotonic() of the last datagram from the server
         self.socket = None
         self.connected = False
         self.room_id = None
         self.player_id = None
         self.game_state = None
+        self.snapshots = {}  # seq -> full game state, oldest first (delta baselines)
+        self.clock = ClockSync()  # Server's room clock, RTT and jitter from PING/PONG
+        self.snapshot_buffer = SnapshotBuffer(clock=self.clock)  # Timestamped states for smooth rendering
+        self.ball_trajectory = BallTrajectory()  # Ball evaluated from BALL_TRAJECTORY events
+        self.predictor = None  # Local player's predicted actions, created at GAME_START or the first GAME_STATE
+        self.clock_thread = None
         self.message_handlers = {}
+        self.send_lock = threading.Lock()
+        self.state_lock = threading.Lock()  # TCP and UDP threads both deliver snapshots
+        self.action_seq = 0
         
     def connect(self):
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Actions and PONGs go out at once, so RTT measures the network and not Nagle
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.socket.connect((self.host, self.port))
             self.connected = True
             
@@ -38,11 +65,14 @@ class NetworkClient:
             self.connected = False
             if self.socket:
                 self.socket.close()
+            if self.udp_socket:
+                self.udp_socket.close()
     
     def send_message(self, message):
         if self.connected and self.socket:
             try:
-                self.socket.send((message.to_json() + '\n').encode())
+                with self.send_lock:
+                    self.socket.sendall(message.encode())
                 return True
             except Exception as e:
                 print(f"Failed to send message: {e}")
@@ -50,50 +80,214 @@ class NetworkClient:
                 return False
         return False
     
+    def send_unreliable(self, message):
+        """Send over UDP once it is up, otherwise over TCP"""
+        if self.udp_active:
+            self.udp_channel.send(message.encode(), self.udp_address, self.udp_token)
+            return True
+        return self.send_message(message)
+    
+    def start_udp(self, udp_port, udp_token):
+        self.udp_address = (self.host, udp_port)
+        self.udp_token = udp_token
+        self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_channel = UdpChannel(self.udp_socket, self.udp_loss)
+        
+        udp_thread = threading.Thread(target=self.receive_datagrams)
+        udp_thread.daemon = True
+        udp_thread.start()
+    
+    def receive_datagrams(self):
+        self.udp_socket.settimeout(UDP_HELLO_INTERVAL)
+        while self.connected:
+            if self.udp_active and time.monotonic() - self.udp_heard > UDP_FALLBACK_TIMEOUT:
+                self.udp_active = False  # Datagrams stopped reaching us: back to TCP, and register again
+            if not self.udp_active:
+                # Keep registering until the server answers over UDP
+                hello = NetworkMessage(MessageType.UDP_HELLO)
+                self.udp_channel.send(hello.encode(), self.udp_address, self.udp_token)
+            try:
+                datagram, _ = self.udp_socket.recvfrom(UDP_MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            
+            packet = self.udp_channel.accept(datagram)
+            if packet is None:
+                continue  # Stale or duplicate
+            self.udp_heard = time.monotonic()
+            self.udp_active = True
+            for message in decode_frames(packet[1]):
+                if message.type == MessageType.UDP_HELLO:
+                    # The server's answer: confirm we got it, so it sends snapshots over UDP
+                    ack = NetworkMessage(MessageType.UDP_HELLO, {'ack': True})
+                    self.udp_channel.send(ack.encode(), self.udp_address, self.udp_token)
+                else:
+                    self.handle_message(message)
+    
     def receive_messages(self):
-        buffer = ""
+        decoder = FrameDecoder()
         try:
             while self.connected:
-                data = self.socket.recv(1024).decode()
-                if not data:
+                messages = decoder.recv_into(self.socket)
+                if messages is None:
                     break
                 
-                buffer += data
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    message = NetworkMessage.from_json(line)
-                    if message:
-                        self.handle_message(message)
+                for message in messages:
+                    self.handle_message(message)
         except Exception as e:
             print(f"Error receiving messages: {e}")
         finally:
             self.connected = False
     
     def handle_message(self, message):
+        if message.type == MessageType.GAME_STATE:
+            # Handlers always see the full state, never a raw delta
+            message.data = self.apply_snapshot(message.data)
+            if message.data is None:
+                return
+        
         if message.type in self.message_handlers:
             self.message_handlers[message.type](message.data)
         
         # Handle common messages
-        if message.type == MessageType.ROOM_CREATED:
-            self.room_id = message.data.get('room_id')
-            self.player_id = message.data.get('player_id')
-        elif message.type == MessageType.ROOM_JOINED:
+        if message.type in (MessageType.ROOM_CREATED, MessageType.ROOM_JOINED):
+            if message.data.get('room_id') != self.room_id:
+                self.clear_snapshots()  # A new room numbers its snapshots from 1 again
             self.room_id = message.data.get('room_id')
             self.player_id = message.data.get('player_id')
+            self.encoding = message.data.get('encoding', ENCODING_JSON)
+            if self.use_udp and 'udp_port' in message.data and not self.udp_socket:
+                self.start_udp(message.data['udp_port'], message.data['udp_token'])
+            self.start_clock_sync()
+        elif message.type == MessageType.PING:
+            self.send_message(create_pong_message(message.data.get('time'), time.perf_counter()))
+        elif message.type == MessageType.PONG:
+            self.clock.add_sample(message.data.get('echo'), message.data.get('time'), time.perf_counter())
+        elif message.type == MessageType.GAME_START:
+            self.clear_snapshots()
+            self.snapshot_buffer.clear()
+            self.ball_trajectory.clear()
+            if self.player_id is not None:
+                self.predictor = PlayerPredictor(self.player_id)
+        elif message.type == MessageType.BALL_TRAJECTORY:
+            self.ball_trajectory.push(message.data)
         elif message.type == MessageType.GAME_STATE:
             self.game_state = message.data
+            if 'seq' in message.data:
+                self.snapshot_buffer.push(message.data, time.perf_counter())
+            if self.predictor is None and self.player_id is not None:
+                # Our join filled the room: GAME_START came before ROOM_JOINED told us our id
+                self.predictor = PlayerPredictor(self.player_id)
+            if self.predictor:
+                self.predictor.reconcile(message.data, time.perf_counter())
+    
+    def render_state(self):
+        """Game state to draw this frame: others interpolated behind the server, ourselves predicted"""
+        now = time.perf_counter()
+        state = self.snapshot_buffer.sample(now) or self.game_state
+        if not state:
+            return state
+        state = dict(state)
+        
+        render_time = self.snapshot_buffer.render_time(now)
+        ball = self.ball_trajectory.state_at(render_time) if render_time is not None else None
+        if ball:
+            state['ball'] = ball
+        
+        if self.predictor:
+            state['players'] = [self.predictor.overlay(player) if player['id'] == self.player_id else player
+                            for player in state['players']]
+        return state
+    
+    def start_clock_sync(self):
+        self.clock.reset()  # Each room has its own clock
+        if self.clock_thread:
+            return
+        self.clock_thread = threading.Thread(target=self.clock_sync_loop)
+        self.clock_thread.daemon = True
+        self.clock_thread.start()
+    
+    def clock_sync_loop(self):
+        pings = 0
+        while self.connected:
+            self.send_message(create_ping_message(time.perf_counter()))
+            pings += 1
+            time.sleep(0.1 if pings < TIME_SYNC_BURST else TIME_SYNC_INTERVAL)
+        self.clock_thread = None
+    
+    def server_time(self):
+        """Current room time on the server, or None until the clock is synced"""
+        if not self.clock.synced:
+            return None
+        return self.clock.remote_time(time.perf_counter())
+    
+    def latency_stats(self):
+        """Live RTT, jitter and clock offset in ms, plus the age of the newest GAME_STATE"""
+        stats = self.clock.stats()
+        if stats and self.game_state and 'time' in self.game_state:
+            stats['snapshot_age_ms'] = (self.server_time() - self.game_state['time']) * 1000
+        return stats
+    
+    def update_prediction(self, dt):
+        if self.predictor:
+            self.predictor.update(dt)
+    
+    def clear_snapshots(self):
+        """Forget the delta baselines of the previous room or game"""
+        with self.state_lock:
+            self.snapshots.clear()
+    
+    def apply_snapshot(self, snapshot):
+        """Rebuild a full state from a keyframe or delta and acknowledge it"""
+        seq = snapshot.get('seq')
+        if seq is None:
+            return snapshot  # Server without delta support
+        
+        with self.state_lock:
+            if self.snapshots and seq <= next(reversed(self.snapshots)):
+                return None  # Older than what we already have
+            
+            baseline_seq = snapshot.get('baseline')
+            if baseline_seq is None:
+                state = snapshot
+            elif baseline_seq in self.snapshots:
+                state = apply_snapshot_delta(self.snapshots[baseline_seq], snapshot)
+            else:
+                return None  # Baseline already dropped; wait for the next keyframe
+            
+            self.snapshots[seq] = state
+            while len(self.snapshots) > SNAPSHOT_HISTORY:
+                del self.snapshots[next(iter(self.snapshots))]
+        
+        self.send_unreliable(create_snapshot_ack_message(seq))
+        return state
     
     def set_message_handler(self, message_type, handler):
         self.message_handlers[message_type] = handler
     
     def create_room(self, player_name):
-        message = create_create_room_message(player_name)
+        message = create_create_room_message(player_name, self.encoding)
         return self.send_message(message)
     
     def join_room(self, room_id, player_name):
-        message = create_join_room_message(room_id, player_name)
+        message = create_join_room_message(room_id, player_name, self.encoding)
         return self.send_message(message)
     
     def send_action(self, action_type):
-        message = create_action_message(action_type)
+        self.action_seq += 1
+        now = time.perf_counter()
+        if self.predictor:
+            # Show the action right away against the ball we are currently drawing
+            state = self.render_state()
+            self.predictor.apply(action_type, self.action_seq, state and state.get('ball'), now)
+        # The server validates hits against the ball as of the room time we are drawing
+        seen_time = self.snapshot_buffer.render_time(now) if action_type == ActionType.HIT else None
+        message = create_action_message(action_type, self.action_seq, seen_time)
+        if self.udp_active:
+            # Several copies survive loss; the server applies the first to arrive
+            for _ in range(UDP_ACTION_REDUNDANCY):
+                self.send_unreliable(message)
+            return True
         return self.send_message(message)
\ No newline at end of file
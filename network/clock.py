@@ -0,0 +1,71 @@
+"""
+Clock synchronization between NetworkClient and GameServer
+
+Either side sends PING carrying its own clock; the other answers PONG with
+that value echoed back and its own clock. From the send time, the remote
+time and the receive time, ClockSync estimates the remote clock's offset
+the way NTP does (assuming the remote time was read halfway through the
+round-trip), keeping the offset from the least-delayed recent sample, and
+smooths RTT and jitter the way TCP does.
+"""
+from collections import deque
+from config.constants import *
+
+# Smoothing gains: RTT and jitter as in TCP (RFC 6298), offset slow enough to avoid visible jumps
+RTT_GAIN = 0.125
+JITTER_GAIN = 0.25
+OFFSET_GAIN = 0.25
+
+class ClockSync:
+    """Estimate of a remote clock, round-trip time and jitter from ping/pong samples"""
+    def __init__(self, window=CLOCK_SYNC_WINDOW):
+        self.samples = deque(maxlen=window)  # (rtt, offset) of recent round-trips
+        self.offset = None  # Remote clock minus local clock
+        self.rtt = None  # Smoothed round-trip time in seconds
+        self.jitter = 0.0  # Smoothed deviation of the round-trip time
+
+    @property
+    def synced(self):
+        return self.offset is not None
+
+    def reset(self):
+        self.samples.clear()
+        self.offset = None
+        self.rtt = None
+        self.jitter = 0.0
+
+    def add_sample(self, sent, remote_time, received):
+        """Record one round-trip: local send time, remote clock from the reply, local receive time"""
+        rtt = received - sent
+        if rtt < 0:
+            return
+        self.samples.append((rtt, remote_time - (sent + received) / 2))
+
+        if self.rtt is None:
+            self.rtt = rtt
+        else:
+            self.jitter += (abs(rtt - self.rtt) - self.jitter) * JITTER_GAIN
+            self.rtt += (rtt - self.rtt) * RTT_GAIN
+
+        # The fastest round-trip has the least room for asymmetric delay
+        best_offset = min(self.samples)[1]
+        if self.offset is None:
+            self.offset = best_offset
+        else:
+            self.offset += (best_offset - self.offset) * OFFSET_GAIN
+
+    def remote_time(self, local_time):
+        return local_time + self.offset
+
+    def local_time(self, remote_time):
+        return remote_time - self.offset
+
+    def stats(self):
+        """Current estimates in milliseconds, for display and logging"""
+        if not self.synced:
+            return None
+        return {
+            'rtt_ms': self.rtt * 1000,
+            'jitter_ms': self.jitter * 1000,
+            'offset_ms': self.offset * 1000
+        }
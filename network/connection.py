@@ -0,0 +1,195 @@
+"""
+Client connection wrappers for the game servers
+
+Both servers write to clients through a bounded outbound queue: a newer
+GAME_STATE snapshot replaces any snapshot still waiting in the queue, and
+a client that falls too far behind is evicted instead of stalling the tick.
+"""
+import asyncio
+import socket
+import threading
+import time
+from collections import deque
+from network.clock import ClockSync
+from config.constants import *
+
+class SlowConsumerError(ConnectionError):
+    """Raised when a client can't keep up with its outbound queue"""
+
+class OutboundQueue:
+    """Bounded queue of encoded messages where a new snapshot supersedes queued ones"""
+    def __init__(self, max_messages=MAX_OUTBOUND_MESSAGES, max_lag=MAX_CLIENT_LAG):
+        self.max_messages = max_messages
+        self.max_lag = max_lag  # Seconds the oldest unsent data may wait
+        self.items = deque()  # (data, is_snapshot, time queued)
+        self.queued_snapshots = 0
+        self.in_flight_since = None  # When the writer started the write still in progress
+        self.max_depth = 0
+        self.snapshots_dropped = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def lag(self, now):
+        """Age of the oldest data that hasn't reached the socket yet"""
+        oldest = self.in_flight_since
+        if self.items and (oldest is None or self.items[0][2] < oldest):
+            oldest = self.items[0][2]
+        return 0.0 if oldest is None else now - oldest
+
+    def push(self, data, snapshot=False):
+        now = time.monotonic()
+        if self.lag(now) > self.max_lag:
+            raise SlowConsumerError(f"Client lagging {self.lag(now):.1f}s behind")
+
+        if snapshot and self.queued_snapshots:
+            # Only the newest snapshot is worth sending
+            kept = deque(item for item in self.items if not item[1])
+            self.snapshots_dropped += len(self.items) - len(kept)
+            self.items = kept
+            self.queued_snapshots = 0
+
+        if len(self.items) >= self.max_messages:
+            raise SlowConsumerError(f"Outbound queue full ({len(self.items)} messages)")
+
+        self.items.append((data, snapshot, now))
+        if snapshot:
+            self.queued_snapshots += 1
+        self.max_depth = max(self.max_depth, len(self.items))
+
+    def pop_all(self):
+        """Take everything queued as one coalesced write"""
+        data = b''.join(item[0] for item in self.items)
+        self.items.clear()
+        self.queued_snapshots = 0
+        return data
+
+def udp_snapshots(connection):
+    """Whether snapshots go over UDP: the client confirmed it gets datagrams and still acks them"""
+    if connection.udp_address is None:
+        return False
+    if time.monotonic() - connection.udp_heard > UDP_FALLBACK_TIMEOUT:
+        connection.udp_address = None  # Back to TCP until the client confirms again
+        return False
+    return True
+
+class ClientConnection:
+    """Socket wrapper whose send() only queues bytes; a writer thread does the blocking I/O"""
+    def __init__(self, client_socket):
+        self.socket = client_socket
+        # Snapshots and PONGs go out now, not when Nagle gets the client's delayed ACK
+        # (asyncio transports already set this for AsyncConnection)
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.outbound = OutboundQueue()
+        self.ready = threading.Condition()
+        self.closed = False
+        self.clock = ClockSync()  # Client's clock and round-trip time, from server PINGs
+        self.udp_channel = None
+        self.udp_token = None
+        self.udp_address = None  # Set once the client confirms it receives our datagrams
+        self.udp_heard = 0.0  # monotonic() of the last datagram showing the client receives ours
+
+        writer_thread = threading.Thread(target=self.write_loop)
+        writer_thread.daemon = True
+        writer_thread.start()
+
+    @property
+    def queue_depth(self):
+        return len(self.outbound)
+
+    def send(self, data, snapshot=False):
+        """Queue already-encoded bytes without blocking the caller"""
+        if self.closed:
+            raise ConnectionError("Connection closed")
+        if snapshot and udp_snapshots(self):
+            return self.udp_channel.send(data, self.udp_address, self.udp_token)
+        try:
+            with self.ready:
+                self.outbound.push(data, snapshot)
+                self.ready.notify()
+        except SlowConsumerError:
+            self.close()
+            raise
+        return len(data)
+
+    def write_loop(self):
+        try:
+            while True:
+                with self.ready:
+                    while not self.outbound and not self.closed:
+                        self.ready.wait()
+                    if self.closed:
+                        return
+                    data = self.outbound.pop_all()
+                    self.outbound.in_flight_since = time.monotonic()
+                self.socket.sendall(data)
+                self.outbound.in_flight_since = None
+        except OSError:
+            pass
+        finally:
+            self.closed = True
+
+    def close(self):
+        with self.ready:
+            self.closed = True
+            self.ready.notify()
+        try:
+            # Wake up the reader thread blocked in recv
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.socket.close()
+
+class AsyncConnection:
+    """Socket-like wrapper so GameRoom can send to an asyncio stream"""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.address = writer.get_extra_info('peername')
+        self.outbound = OutboundQueue()
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.clock = ClockSync()  # Client's clock and round-trip time, from server PINGs
+        self.udp_channel = None
+        self.udp_token = None
+        self.udp_address = None  # Set once the client confirms it receives our datagrams
+        self.udp_heard = 0.0  # monotonic() of the last datagram showing the client receives ours
+        self.writer_task = asyncio.get_running_loop().create_task(self.write_loop())
+
+    @property
+    def queue_depth(self):
+        return len(self.outbound)
+
+    def send(self, data, snapshot=False):
+        if self.closed or self.writer.is_closing():
+            raise ConnectionError("Connection closed")
+        if snapshot and udp_snapshots(self):
+            return self.udp_channel.send(data, self.udp_address, self.udp_token)
+        try:
+            self.outbound.push(data, snapshot)
+        except SlowConsumerError:
+            self.close()
+            raise
+        self.ready.set()
+        return len(data)
+
+    async def write_loop(self):
+        try:
+            while not self.closed:
+                await self.ready.wait()
+                self.ready.clear()
+                if not self.outbound:
+                    continue
+                self.outbound.in_flight_since = time.monotonic()
+                self.writer.write(self.outbound.pop_all())
+                await self.writer.drain()
+                self.outbound.in_flight_since = None
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.closed = True
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+        self.writer.close()
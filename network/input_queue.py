@@ -0,0 +1,60 @@
+"""
+Ordered input queue for the P2P host
+
+Every HIT and DODGE is kept with the tick it arrived in, instead of only
+each player's latest action, and applied at the next tick in an order that
+depends only on what arrived when - not on which socket or thread got
+there first. Within one arrival tick players take turns, one action each,
+starting from a seat that rotates every tick, so ties don't always go to
+the same player (the host included). Each player's own actions keep their
+order.
+"""
+import time
+from collections import deque
+from config.constants import *
+
+class InputQueue:
+    """Actions waiting for the next tick, plus input-to-apply latency per player"""
+    def __init__(self, num_players=4):
+        self.num_players = num_players
+        self.incoming = deque()  # (arrival tick, player_id, action, arrival time); appends are thread-safe
+        self.latencies = {}  # player_id -> recent input-to-apply delays in seconds
+        self.applied = 0
+
+    def push(self, tick, player_id, action, now=None):
+        """Queue an action that arrived during `tick` (safe from any thread)"""
+        self.incoming.append((tick, player_id, action, time.perf_counter() if now is None else now))
+
+    def drain(self, now=None):
+        """Take every queued action, in the order to apply them: [(player_id, action)]"""
+        if now is None:
+            now = time.perf_counter()
+        entries = []
+        turns = {}  # (arrival tick, player_id) -> actions seen so far
+        while self.incoming:
+            tick, player_id, action, arrived = self.incoming.popleft()
+            turn = turns.get((tick, player_id), 0)
+            turns[(tick, player_id)] = turn + 1
+            seat = (player_id - tick) % self.num_players  # Who goes first rotates every tick
+            entries.append(((tick, turn, seat), player_id, action, arrived))
+        entries.sort(key=lambda entry: entry[0])
+
+        for _, player_id, _, arrived in entries:
+            if player_id not in self.latencies:
+                self.latencies[player_id] = deque(maxlen=INPUT_STATS_WINDOW)
+            self.latencies[player_id].append(now - arrived)
+        self.applied += len(entries)
+        return [(player_id, action) for _, player_id, action, _ in entries]
+
+    def latency_stats(self):
+        """Input-to-apply delay per player id in milliseconds, over the last INPUT_STATS_WINDOW actions"""
+        stats = {}
+        for player_id, delays in self.latencies.items():
+            ordered = sorted(delays)
+            stats[player_id] = {
+                'inputs': len(ordered),
+                'mean_ms': sum(ordered) / len(ordered) * 1000,
+                'p95_ms': ordered[int(len(ordered) * 0.95)] * 1000,
+                'max_ms': ordered[-1] * 1000
+            }
+        return stats
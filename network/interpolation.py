@@ -0,0 +1,91 @@
+"""
+Client-side snapshot interpolation
+
+The server sends GAME_STATE at SNAPSHOT_RATE, which is slower than the
+client's frame rate and arrives with jitter. SnapshotBuffer keeps recent
+snapshots on the server's timeline (each snapshot carries the room time)
+and renders INTERPOLATION_DELAY behind it, blending the two snapshots that
+bracket the render time. The server's current time comes from ClockSync
+once it has a sample, and is guessed from snapshot arrivals until then.
+The ball is not in snapshots; see trajectory.py.
+"""
+from collections import deque
+from config.constants import *
+
+# How fast the clock offset follows snapshots that arrive later than the fastest one
+OFFSET_SMOOTHING = 0.05
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+def interpolate_player(old, new, t):
+    player = dict(new if t >= 0.5 else old)  # Discrete fields come from the nearer snapshot
+    player['x'] = lerp(old['x'], new['x'], t)
+    player['y'] = lerp(old['y'], new['y'], t)
+    # Degrees of swing, always within +-90, so it never wraps around
+    player['stick_angle'] = lerp(old['stick_angle'], new['stick_angle'], t)
+    return player
+
+def interpolate_game_state(old, new, t):
+    """Blend two full game states; t=0 gives old, t=1 gives new"""
+    old_players = {player['id']: player for player in old['players']}
+    players = [interpolate_player(old_players[player['id']], player, t) if player['id'] in old_players else player
+               for player in new['players']]
+    state = dict(new if t >= 0.5 else old)
+    state['players'] = players
+    state['time'] = lerp(old['time'], new['time'], t)
+    return state
+
+class SnapshotBuffer:
+    """Timestamped snapshots sampled at a fixed delay behind the server"""
+    def __init__(self, delay=INTERPOLATION_DELAY, clock=None):
+        self.delay = delay
+        self.clock = clock  # ClockSync for the server's clock, if available
+        self.snapshots = deque(maxlen=SNAPSHOT_BUFFER_SIZE)  # (server time, state), oldest first
+        self.offset = None  # Local clock minus server time, from the least-delayed arrivals
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def clear(self):
+        self.snapshots.clear()
+        self.offset = None
+
+    def push(self, state, now):
+        """Add a full snapshot that arrived at local time `now`"""
+        server_time = state['time']
+        offset = now - server_time
+        if self.offset is None or offset < self.offset:
+            self.offset = offset
+        else:
+            # Follow clock drift without letting one late packet shift the timeline
+            self.offset += (offset - self.offset) * OFFSET_SMOOTHING
+
+        if self.snapshots and server_time <= self.snapshots[-1][0]:
+            return  # Out of order
+        self.snapshots.append((server_time, state))
+
+    def render_time(self, now):
+        """Server time drawn at local time `now`, or None before the first snapshot"""
+        if self.clock and self.clock.synced:
+            return self.clock.remote_time(now) - self.delay
+        if self.offset is None:
+            return None
+        return now - self.offset - self.delay
+
+    def sample(self, now):
+        """Game state to draw at local time `now`, or None before the first snapshot"""
+        snapshots = list(self.snapshots)  # The network thread may push while we render
+        if not snapshots:
+            return None
+
+        render_time = self.render_time(now)
+        if render_time <= snapshots[0][0]:
+            return snapshots[0][1]
+        if render_time >= snapshots[-1][0]:
+            return snapshots[-1][1]  # Buffer ran dry: hold the newest state
+
+        for (old_time, old), (new_time, new) in zip(snapshots, snapshots[1:]):
+            if old_time <= render_time <= new_time:
+                t = (render_time - old_time) / (new_time - old_time)
+                return interpolate_game_state(old, new, t)
@@ -0,0 +1,121 @@
+"""
+Client-side prediction for the local player's HIT and DODGE
+
+Actions are applied to a local copy of the player straight away, using the
+same Player model the server runs, so the swing or dodge shows up without
+waiting a round-trip. Each action carries a sequence number; snapshots
+echo the last one the server processed for every player, and when an
+acknowledged action turns out differently on the server the local player
+is corrected to the authoritative state.
+"""
+import math
+import threading
+from collections import deque
+from models.player import Player
+from models.ball import Ball
+from models.player_state import PlayerState
+from network.protocol import ActionType
+from config.constants import *
+
+# States only the server decides (collisions); prediction stops once they appear
+SERVER_ONLY_STATES = (PlayerState.FLYING_OFF, PlayerState.ELIMINATED)
+
+def ball_from_state(ball_state):
+    """Scratch Ball matching a snapshot, for hit checks against what the player sees"""
+    ball = Ball()
+    ball.angle = ball_state['angle']
+    ball.is_active = ball_state['is_active']
+    ball.x, ball.y = ball.get_position()
+    return ball
+
+class PlayerPredictor:
+    def __init__(self, player_id):
+        angle = player_id * (2 * math.pi / 4)  # Same layout as Game
+        self.player = Player(player_id, angle, PLAYER_COLORS[player_id])
+        self.pending = deque()  # (seq, predicted state, time pressed) not yet acknowledged
+        self.mispredictions = 0
+        self.lock = threading.Lock()  # Snapshots are reconciled on the network thread
+
+    @property
+    def active(self):
+        return self.player.state not in SERVER_ONLY_STATES
+
+    def apply(self, action, seq, ball_state, now):
+        """Run an action locally the moment it is sent"""
+        with self.lock:
+            if not self.active:
+                return
+            if action == ActionType.HIT and ball_state:
+                self.player.hit_ball(ball_from_state(ball_state))  # Only the swing is predicted, not the ball
+            elif action == ActionType.DODGE:
+                self.player.start_dodge()
+            self.pending.append((seq, self.player.state, now))
+
+    def update(self, dt):
+        with self.lock:
+            if self.active:
+                self.player.update(dt)
+
+    def reconcile(self, state, now):
+        """Check acknowledged predictions against an authoritative snapshot"""
+        with self.lock:
+            self.reconcile_locked(state, now)
+
+    def reconcile_locked(self, state, now):
+        server = next((p for p in state['players'] if p['id'] == self.player.id), None)
+        if server is None:
+            return
+        server_state = PlayerState(server['state'])
+
+        if server_state in SERVER_ONLY_STATES:
+            self.pending.clear()
+            self.player.state = server_state
+            self.player.x = server['x']
+            self.player.y = server['y']
+            return
+
+        acked_seq = server.get('action_seq')
+        if acked_seq is None:
+            self.pending.clear()  # Server doesn't echo action seqs; nothing to reconcile
+            return
+
+        # The first snapshot after an action shows its outcome (dodge and swing outlast a snapshot)
+        acked = None
+        while self.pending and self.pending[0][0] <= acked_seq:
+            acked = self.pending.popleft()
+        if acked is not None and acked[1] != server_state:
+            self.correct(server, server_state, now - acked[2])
+
+    def correct(self, server, server_state, elapsed):
+        """Replace a misprediction with the server's state, aged by the time since the key press"""
+        player = self.player
+        self.mispredictions += 1
+        player.state = PlayerState.STANDING
+        player.dodge_timer = 0
+        player.swing_timer = 0
+        player.swing_progress = 0
+        player.swing_target_angle = 0
+        player.stick_angle = 0
+        player.hit_cooldown = 0
+
+        if server_state == PlayerState.DODGING:
+            player.start_dodge()
+            player.dodge_timer -= elapsed
+        elif server_state == PlayerState.SWINGING:
+            player.state = PlayerState.SWINGING
+            player.swing_timer = SWING_DURATION - elapsed
+            player.hit_cooldown = HIT_COOLDOWN - elapsed
+            # The full swing; stick_angle is only target * sin(pi * progress) of it
+            player.swing_target_angle = server['swing_target']
+        player.update_position()
+
+    def overlay(self, player_state):
+        """Snapshot entry for the local player with the predicted state drawn on top"""
+        if not self.active:
+            return player_state
+        predicted = dict(player_state)
+        predicted['state'] = self.player.state.value
+        predicted['x'] = self.player.x
+        predicted['y'] = self.player.y
+        predicted['stick_angle'] = self.player.stick_angle
+        return predicted
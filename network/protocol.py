@@ -3,6 +3,45 @@ Network protocol definitions for Hit & Dodge game
 """
 from enum import Enum
 import json
+import struct
+from config.constants import PLAYER_COLORS, RECV_BUFFER_SIZE, MAX_FRAME_SIZE
+
+# Snapshot encodings negotiated at join time
+ENCODING_JSON = "json"
+ENCODING_BINARY = "binary"
+SUPPORTED_ENCODINGS = (ENCODING_JSON, ENCODING_BINARY)
+
+# Every message on the stream (and in a datagram) is a length-prefixed frame:
+#   kind (B) | payload length (I) | payload
+# so a receiver knows where a message ends before decoding any of it.
+FRAME_BINARY = 0x00  # Binary GAME_STATE
+FRAME_JSON = 0x01  # UTF-8 JSON object
+FRAME_HEADER = struct.Struct('<BI')
+
+# Binary GAME_STATE payload, little-endian:
+#   header: message tag (B), seq (I), baseline seq (I, 0 = keyframe), server time (d),
+#           player count (B), flags (B: bit 0 = game over, bit 1 = game over field present)
+#   player: id (B), field mask (B), then the masked fields in PLAYER_FIELDS order
+# Keyframes set every mask bit; deltas only carry the fields that changed.
+# The ball is not part of GAME_STATE; it travels as BALL_TRAJECTORY events.
+BINARY_GAME_STATE_TAG = 1
+GAME_STATE_HEADER = struct.Struct('<BIIdBB')
+PLAYER_FIELDS = (('state', 'B'), ('x', 'f'), ('y', 'f'), ('stick_angle', 'f'), ('swing_target', 'f'),
+                 ('action_seq', 'I'))
+
+def compile_field_structs(header, fields):
+    """Precompile one (field names, struct) pair per field mask"""
+    structs = []
+    for mask in range(1 << len(fields)):
+        present = [field for bit, field in enumerate(fields) if mask & (1 << bit)]
+        names = tuple(name for name, _ in present)
+        structs.append((names, struct.Struct(header + ''.join(code for _, code in present))))
+    return structs
+
+# Records include their own (id, mask) header
+PLAYER_STRUCTS = compile_field_structs('<BB', PLAYER_FIELDS)
+PLAYER_FULL_MASK = len(PLAYER_STRUCTS) - 1
+PLAYER_FIELD_BITS = tuple((name, 1 << bit) for bit, (name, _) in enumerate(PLAYER_FIELDS))
 
 class MessageType(Enum):
     # Client to Server
@@ -10,6 +49,8 @@ class MessageType(Enum):
     CREATE_ROOM = "create_room"
     LEAVE_ROOM = "leave_room"
     PLAYER_ACTION = "player_action"
+    SNAPSHOT_ACK = "snapshot_ack"
+    UDP_HELLO = "udp_hello"
     
     # Server to Client
     ROOM_JOINED = "room_joined"
@@ -20,9 +61,14 @@ class MessageType(Enum):
     PLAYER_LEFT = "player_left"
     ROOM_UPDATE = "room_update"
     GAME_STATE = "game_state"
+    BALL_TRAJECTORY = "ball_trajectory"
     GAME_START = "game_start"
     GAME_OVER = "game_over"
     ERROR = "error"
+    
+    # Both directions (clock sync)
+    PING = "ping"
+    PONG = "pong"
 
 class ActionType(Enum):
     HIT = "hit"
@@ -34,10 +80,23 @@ class NetworkMessage:
         self.data = data if data else {}
     
     def to_json(self):
+        # Non-ASCII (Vietnamese names) goes out as UTF-8, not \u escapes: frames are only decoded once complete
         return json.dumps({
             'type': self.type.value if isinstance(self.type, MessageType) else self.type,
             'data': self.data
-        })
+        }, ensure_ascii=False)
+    
+    def wire_encoding(self, encoding):
+        """Encoding actually used on the wire; only GAME_STATE has a binary form"""
+        if encoding == ENCODING_BINARY and self.type == MessageType.GAME_STATE:
+            return ENCODING_BINARY
+        return ENCODING_JSON
+    
+    def encode(self, encoding=ENCODING_JSON):
+        """Encode the message as bytes ready to write to the stream"""
+        if self.wire_encoding(encoding) == ENCODING_BINARY:
+            return pack_frame(FRAME_BINARY, encode_game_state_binary(self.data))
+        return pack_frame(FRAME_JSON, self.to_json().encode())
     
     @classmethod
     def from_json(cls, json_str):
@@ -47,21 +106,226 @@ class NetworkMessage:
             return cls(msg_type, data.get('data', {}))
         except (json.JSONDecodeError, ValueError, KeyError):
             return None
+    
+    @classmethod
+    def from_binary(cls, payload):
+        try:
+            if payload[0] == BINARY_GAME_STATE_TAG:
+                return cls(MessageType.GAME_STATE, decode_game_state_binary(payload))
+        except (struct.error, IndexError):
+            pass
+        return None
+    
+    @classmethod
+    def from_frame(cls, kind, payload):
+        """Decode one complete frame payload (bytes or memoryview)"""
+        if kind == FRAME_BINARY:
+            return cls.from_binary(payload)
+        if kind == FRAME_JSON:
+            # The whole message is here, so multi-byte UTF-8 is never split
+            return cls.from_json(str(payload, 'utf-8', 'replace'))
+        return None
+
+def field_mask(record, field_bits):
+    mask = 0
+    for name, bit in field_bits:
+        if name in record:
+            mask |= bit
+    return mask
+
+def encode_game_state_binary(game_state):
+    """Pack a keyframe or delta game state into the binary layout"""
+    players = game_state['players']
+    keyframe = game_state.get('baseline') is None
+    flags = 0
+    if 'game_over' in game_state:
+        flags = 2 | (1 if game_state['game_over'] else 0)
+    parts = [GAME_STATE_HEADER.pack(
+        BINARY_GAME_STATE_TAG, game_state.get('seq', 0), game_state.get('baseline') or 0,
+        game_state.get('time', 0.0), len(players), flags
+    )]
+    
+    for player in players:
+        mask = PLAYER_FULL_MASK if keyframe else field_mask(player, PLAYER_FIELD_BITS)
+        names, record = PLAYER_STRUCTS[mask]
+        parts.append(record.pack(player['id'], mask, *[player[name] for name in names]))
+    return b''.join(parts)
+
+def decode_game_state_binary(payload):
+    """Unpack a binary game state into the same dict the JSON path produces"""
+    _, seq, baseline, server_time, player_count, flags = GAME_STATE_HEADER.unpack_from(payload, 0)
+    keyframe = baseline == 0
+    offset = GAME_STATE_HEADER.size
+    
+    players = []
+    for _ in range(player_count):
+        player_id = payload[offset]
+        names, record = PLAYER_STRUCTS[payload[offset + 1]]
+        player = dict(zip(names, record.unpack_from(payload, offset)[2:]))
+        offset += record.size
+        player['id'] = player_id
+        if keyframe:
+            player['color'] = PLAYER_COLORS[player_id % len(PLAYER_COLORS)]
+        players.append(player)
+    
+    state = {
+        'seq': seq,
+        'baseline': None if keyframe else baseline,
+        'time': server_time,
+        'players': players
+    }
+    if flags & 2:
+        state['game_over'] = bool(flags & 1)
+    return state
 
-def create_join_room_message(room_id, player_name):
+def pack_frame(kind, payload):
+    return FRAME_HEADER.pack(kind, len(payload)) + payload
+
+def json_frame(obj):
+    """Frame a plain JSON object (the P2P messages)"""
+    return pack_frame(FRAME_JSON, json.dumps(obj, ensure_ascii=False).encode())
+
+def decode_json_frame(kind, payload):
+    if kind != FRAME_JSON:
+        return None
+    try:
+        return json.loads(str(payload, 'utf-8', 'replace'))
+    except json.JSONDecodeError:
+        return None
+
+def parse_frames(view, start, end, decode, messages):
+    """Decode the complete frames in view[start:end] into messages; returns where the next frame starts"""
+    while end - start >= FRAME_HEADER.size:
+        kind, length = FRAME_HEADER.unpack_from(view, start)
+        if length > MAX_FRAME_SIZE:
+            raise ValueError(f"Frame of {length} bytes is over MAX_FRAME_SIZE")
+        frame_end = start + FRAME_HEADER.size + length
+        if frame_end > end:
+            break
+        # Decoded straight from the buffer; the payload is never copied out
+        message = decode(kind, view[start + FRAME_HEADER.size:frame_end])
+        if message is not None:
+            messages.append(message)
+        start = frame_end
+    return start
+
+def decode_frames(data, decode=NetworkMessage.from_frame):
+    """Messages in a buffer holding only whole frames, such as a datagram payload"""
+    messages = []
+    with memoryview(data) as view:
+        parse_frames(view, 0, len(view), decode, messages)
+    return messages
+
+class FrameDecoder:
+    """Splits a received byte stream into length-prefixed frames
+
+    Bytes land in one reusable buffer (straight from the socket with
+    recv_into), and frames are decoded in place once complete. Partial
+    frames are moved to the front of the buffer, and the buffer only grows
+    for a frame bigger than it.
+    """
+    def __init__(self, decode=NetworkMessage.from_frame, size=RECV_BUFFER_SIZE):
+        self.decode = decode  # (kind, payload) -> message, or None to skip it
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # First byte not yet decoded
+        self.end = 0  # End of the bytes received
+    
+    def reserve(self, size):
+        """Make room for at least `size` more bytes after self.end"""
+        if self.end + size <= len(self.buffer):
+            return
+        pending = self.end - self.start
+        capacity = len(self.buffer)
+        while pending + size > capacity:
+            capacity *= 2
+        if capacity > len(self.buffer):
+            buffer = bytearray(capacity)
+            buffer[:pending] = self.view[self.start:self.end]
+            self.buffer, self.view = buffer, memoryview(buffer)
+        else:
+            # Only the tail of one partial frame is moved
+            self.buffer[:pending] = bytes(self.view[self.start:self.end])
+        self.start, self.end = 0, pending
+    
+    def recv_into(self, sock):
+        """Receive from a socket straight into the buffer; returns the complete messages, or None once the peer closed"""
+        pending = self.end - self.start
+        frame_size = FRAME_HEADER.size
+        if pending >= FRAME_HEADER.size:
+            _, length = FRAME_HEADER.unpack_from(self.view, self.start)
+            frame_size += min(length, MAX_FRAME_SIZE)
+        # Room for at least the rest of the frame in progress
+        self.reserve(max(frame_size - pending, 1))
+        received = sock.recv_into(self.view[self.end:])
+        if not received:
+            return None
+        self.end += received
+        return self.messages()
+    
+    def receive(self, sock):
+        """Block until at least one whole message has arrived; None once the peer closed"""
+        messages = []
+        while not messages:
+            messages = self.recv_into(sock)
+            if messages is None:
+                return None
+        return messages
+    
+    def feed(self, data):
+        """Add bytes received some other way (asyncio streams) and return the complete messages they finish"""
+        self.reserve(len(data))
+        self.view[self.end:self.end + len(data)] = data
+        self.end += len(data)
+        return self.messages()
+    
+    def messages(self):
+        messages = []
+        self.start = parse_frames(self.view, self.start, self.end, self.decode, messages)
+        if self.start == self.end:
+            self.start = self.end = 0  # Everything decoded: reuse the buffer from the front
+        return messages
+
+def create_join_room_message(room_id, player_name, encoding=ENCODING_JSON):
     return NetworkMessage(MessageType.JOIN_ROOM, {
         'room_id': room_id,
-        'player_name': player_name
+        'player_name': player_name,
+        'encoding': encoding
     })
 
-def create_create_room_message(player_name):
+def create_create_room_message(player_name, encoding=ENCODING_JSON):
     return NetworkMessage(MessageType.CREATE_ROOM, {
-        'player_name': player_name
+        'player_name': player_name,
+        'encoding': encoding
     })
 
-def create_action_message(action_type):
-    return NetworkMessage(MessageType.PLAYER_ACTION, {
+def create_action_message(action_type, seq=None, seen_time=None):
+    data = {
         'action': action_type.value if isinstance(action_type, ActionType) else action_type
+    }
+    if seq is not None:
+        data['seq'] = seq  # Lets the server drop duplicate copies sent over UDP
+    if seen_time is not None:
+        data['time'] = seen_time  # Room time the player was looking at, for lag compensation
+    return NetworkMessage(MessageType.PLAYER_ACTION, data)
+
+def create_ball_trajectory_message(trajectory, server_time):
+    data = dict(trajectory)
+    data['time'] = server_time  # Room time the trajectory starts from
+    return NetworkMessage(MessageType.BALL_TRAJECTORY, data)
+
+def create_ping_message(local_time):
+    return NetworkMessage(MessageType.PING, {'time': local_time})
+
+def create_pong_message(ping_time, local_time):
+    return NetworkMessage(MessageType.PONG, {
+        'echo': ping_time,  # The PING's own timestamp, so the sender can measure the round-trip
+        'time': local_time
+    })
+
+def create_snapshot_ack_message(seq):
+    return NetworkMessage(MessageType.SNAPSHOT_ACK, {
+        'seq': seq
     })
 
 def create_game_state_message(game_state):
@@ -0,0 +1,46 @@
+"""
+Fixed-timestep tick scheduler for the game servers
+"""
+from config.constants import *
+
+class TickScheduler:
+    """Schedules simulation steps against absolute deadlines so the tick rate never drifts"""
+    def __init__(self, tick_rate=SERVER_TICK_RATE, max_catchup_steps=MAX_CATCHUP_STEPS):
+        self.dt = 1.0 / tick_rate  # Fixed simulation step in seconds
+        self.max_catchup_steps = max_catchup_steps
+        self.next_deadline = None
+        self.last_step_time = None  # Nominal time of the most recent step (its deadline)
+        self.ticks = 0  # Steps run so far
+        self.overruns = 0  # Wake-ups that found more than one step due
+        self.dropped_steps = 0  # Steps skipped because catch-up was capped
+
+    def due_steps(self, now):
+        """Return how many fixed steps should run at time `now`"""
+        if self.next_deadline is None:
+            self.next_deadline = now
+
+        if now < self.next_deadline:
+            return 0
+
+        steps = int((now - self.next_deadline) / self.dt) + 1
+        if steps > 1:
+            self.overruns += 1
+
+        if steps > self.max_catchup_steps:
+            # Too far behind to catch up - give up on the backlog and re-anchor
+            self.dropped_steps += steps - self.max_catchup_steps
+            steps = self.max_catchup_steps
+            self.last_step_time = now
+            self.next_deadline = now + self.dt
+        else:
+            self.last_step_time = self.next_deadline + (steps - 1) * self.dt
+            self.next_deadline += steps * self.dt
+
+        self.ticks += steps
+        return steps
+
+    def time_until_next_tick(self, now):
+        """Seconds to sleep before the next deadline"""
+        if self.next_deadline is None:
+            return 0.0
+        return max(0.0, self.next_deadline - now)
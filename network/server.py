@@ -1,34 +1,67 @@
 """
 Game server for Hit & Dodge multiplayer
 """
+import os
 import socket
 import threading
 import time
 import random
 import string
+from collections import deque
 from models.game import Game
+from models.replay import ReplayWriter
 from models.player_state import PlayerState
 from network.protocol import *
+from network.scheduler import TickScheduler
+from network.connection import ClientConnection, SlowConsumerError
+from network.udp import UdpChannel
+from network.snapshot import make_keyframe, diff_game_state
+from config.constants import *
 
 class GameRoom:
-    def __init__(self, room_id, max_players=4):
+    def __init__(self, room_id, max_players=4, replay_dir=None):
         self.room_id = room_id
         self.max_players = max_players
         self.players = {}  # client_socket -> player_info
         self.game = None
         self.game_running = False
-        self.last_update = time.time()
+        self.pending_actions = deque()  # (player_id, action, seen_time) to apply before the next step
+        self.replay_dir = replay_dir  # Record every game here, if set
+        self.replay = None  # ReplayWriter of the current game
+        self.games_played = 0
+        self.time = 0.0  # Simulated seconds; the timeline snapshots and ball trajectories share
+        self.last_tick = None  # perf_counter() time that self.time corresponds to, once ticking
+        self.next_ping = 0.0  # Room time of the next PING to every player
+        self.ball_signature = None  # (is_active, speed, direction) last sent as a trajectory
+        self.ball_history = deque(maxlen=int(MAX_HIT_REWIND * SERVER_TICK_RATE) + 2)  # (time, x, y, is_active) per step
+        self.rewound_hits = 0  # HITs validated against a past ball position
+        self.snapshot_seq = 0
+        self.snapshot_ticks = max(1, round(SERVER_TICK_RATE / SNAPSHOT_RATE))  # Ticks between snapshots
+        self.ticks_since_snapshot = 0
+        self.snapshot_history = {}  # seq -> serialized game state, oldest first
+        self.encode_time = 0.0  # Seconds spent encoding outgoing messages
+        self.messages_encoded = 0
+        self.bytes_sent = 0
+        self.evicted = 0  # Clients dropped for falling too far behind
+        self.last_activity = 0.0  # Room time of the last join, action or game start
+        self.finished_at = None  # Room time GAME_OVER was sent; a full room can't start another game
         
-    def add_player(self, client_socket, player_name):
+    def add_player(self, client_socket, player_name, encoding=ENCODING_JSON):
         if len(self.players) >= self.max_players:
             return False
         
-        player_id = len(self.players)
+        # Lowest id free: one a leaver gave up, or the next one
+        taken = {info['id'] for info in self.players.values()}
+        player_id = min(set(range(self.max_players)) - taken)
         self.players[client_socket] = {
             'id': player_id,
             'name': player_name,
-            'socket': client_socket
+            'socket': client_socket,
+            'encoding': encoding,
+            'acked_seq': None,  # Latest snapshot the client confirmed, used as delta baseline
+            'last_action_seq': 0
         }
+        self.last_activity = self.time
         
         # Send room update to all players
         self.send_room_update()
@@ -44,7 +77,7 @@ class GameRoom:
             del self.players[client_socket]
             # Send room update to remaining players
             self.send_room_update()
-            # Stop game if not enough players
+            # Stop game if not enough players; the tick closes its replay, between two steps
             if len(self.players) < self.max_players:
                 self.game_running = False
     
@@ -65,52 +98,140 @@ class GameRoom:
         self.broadcast_message(update_msg)
     
     def start_game(self):
+        self.close_replay()
         self.game = Game()
         self.game_running = True
+        self.games_played += 1
+        self.last_activity = self.time
+        self.finished_at = None
+        self.pending_actions.clear()
+        if self.replay_dir:
+            self.start_replay()
+        
+        # Baselines from a previous game are useless for the new one
+        self.snapshot_history.clear()
+        self.ball_signature = None
+        self.ball_history.clear()
+        for player_info in self.players.values():
+            player_info['acked_seq'] = None
         
         # Notify all players that game is starting
         start_msg = NetworkMessage(MessageType.GAME_START)
         self.broadcast_message(start_msg)
     
-    def handle_player_action(self, client_socket, action):
+    def handle_player_action(self, client_socket, action, seq=None, seen_time=None):
         if not self.game_running or client_socket not in self.players:
             return
         
         player_info = self.players[client_socket]
         player_id = player_info['id']
         
-        if player_id < len(self.game.players):
-            player = self.game.players[player_id]
+        # Actions sent over UDP arrive in several copies; apply each one once
+        if seq is not None:
+            if seq <= player_info['last_action_seq']:
+                return
+            player_info['last_action_seq'] = seq
+        
+        # Applied by the tick, so every action lands between two steps and replays exactly
+        self.pending_actions.append((player_id, action, seen_time))
+        self.last_activity = self.time
+    
+    def apply_pending_actions(self):
+        """Apply the actions received since the last tick, in arrival order"""
+        while self.pending_actions:
+            player_id, action, seen_time = self.pending_actions.popleft()
+            if player_id >= len(self.game.players):
+                continue
             
+            seen_ball = None
+            if action == ActionType.HIT.value and seen_time is not None:
+                # Judge the hit against where the player saw the ball, not where it is now
+                seen_ball = self.ball_seen_at(seen_time)
+                if seen_ball:
+                    self.rewound_hits += 1
+            self.game.apply_action(player_id, action, seen_ball)
             if action == ActionType.HIT.value:
-                player.hit_ball(self.game.ball)
-            elif action == ActionType.DODGE.value:
-                player.start_dodge()
+                self.send_ball_trajectory()
     
-    def update_game(self):
+    def start_replay(self):
+        """Stream the new game's seed and inputs to a file in replay_dir"""
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(self.replay_dir, f"{stamp}-{self.room_id}-{self.games_played}.jsonl.gz")
+        names = [info['name'] for info in sorted(self.players.values(), key=lambda info: info['id'])]
+        try:
+            self.replay = ReplayWriter(path, self.game, 1.0 / SERVER_TICK_RATE, room=self.room_id, players=names)
+        except OSError as e:
+            print(f"Could not record replay {path}: {e}")
+    
+    def close_replay(self):
+        if self.replay:
+            self.replay.close(self.game)
+            self.replay = None
+    
+    def update_game(self, dt, steps=1, step_time=None):
+        """Advance the game by `steps` fixed steps of `dt` and broadcast the result"""
+        # step_time is when the last step was due; it anchors the room clock
+        if step_time is None:
+            step_time = time.perf_counter()
+        
+        if self.time >= self.next_ping:
+            self.next_ping = self.time + TIME_SYNC_INTERVAL
+            self.ping_players()
+        
         if not self.game_running or not self.game:
+            # A game stopped because a player left ends its replay here, never mid-step
+            self.close_replay()
+            # The room clock keeps running between games so clients stay in sync
+            self.time += dt * steps
+            self.last_tick = step_time
             return
         
-        current_time = time.time()
-        dt = current_time - self.last_update
-        self.last_update = current_time
+        self.apply_pending_actions()
+        ball = self.game.ball
+        for _ in range(steps):
+            self.game.update(dt)
+            self.time += dt
+            self.ball_history.append((self.time, ball.x, ball.y, ball.is_active))
+            self.send_ball_trajectory()
+        self.last_tick = step_time
         
-        self.game.update(dt)
-        
-        # Send game state to all players
-        game_state = self.serialize_game_state()
-        state_msg = create_game_state_message(game_state)
-        self.broadcast_message(state_msg)
+        # Send game state at SNAPSHOT_RATE; clients interpolate between snapshots
+        self.ticks_since_snapshot += steps
+        if self.ticks_since_snapshot >= self.snapshot_ticks or self.game.game_over:
+            self.ticks_since_snapshot = 0
+            self.broadcast_game_state(self.serialize_game_state())
         
         # Check if game is over
         if self.game.game_over:
             self.game_running = False
+            self.finished_at = self.time
+            self.close_replay()
             game_over_msg = NetworkMessage(MessageType.GAME_OVER, {
                 'winner_id': self.game.winner.id if self.game.winner else None
             })
             self.broadcast_message(game_over_msg)
     
+    def is_idle(self):
+        """True once the room has waited ROOM_IDLE_TIMEOUT with no game running and nobody joining or playing"""
+        return not self.game_running and self.time - self.last_activity >= ROOM_IDLE_TIMEOUT
+    
+    def is_finished(self):
+        """True ROOM_FINISHED_TIMEOUT after GAME_OVER, once players have had time to see who won"""
+        return self.finished_at is not None and self.time - self.finished_at >= ROOM_FINISHED_TIMEOUT
+    
+    def close(self, reason=None):
+        """Tell the remaining players the room is gone and release it"""
+        if reason and self.players:
+            self.broadcast_message(NetworkMessage(MessageType.ERROR, {'message': reason}))
+        self.game_running = False
+        self.close_replay()
+        self.players.clear()
+        self.pending_actions.clear()
+        self.snapshot_history.clear()
+        self.ball_history.clear()
+    
     def serialize_game_state(self):
+        action_seqs = {info['id']: info['last_action_seq'] for info in self.players.values()}
         players_data = []
         for player in self.game.players:
             players_data.append({
@@ -119,38 +240,158 @@ class GameRoom:
                 'y': player.y,
                 'state': player.state.value,
                 'stick_angle': player.stick_angle,
-                'color': player.color
+                'swing_target': player.swing_target_angle,  # Radians; stick_angle is only part of it mid-swing
+                'color': player.color,
+                'action_seq': action_seqs.get(player.id, 0)  # Lets clients reconcile predicted actions
             })
         
-        ball_data = {
-            'x': self.game.ball.get_position()[0],
-            'y': self.game.ball.get_position()[1],
-            'is_active': self.game.ball.is_active,
-            'spawn_timer': self.game.ball.spawn_timer
-        }
-        
         return {
+            'time': self.time,
             'players': players_data,
-            'ball': ball_data,
             'game_over': self.game.game_over
         }
     
+    def send_ball_trajectory(self):
+        """Tell clients about the ball only when its motion changes; they compute positions themselves"""
+        ball = self.game.ball
+        signature = (ball.is_active, ball.speed, ball.direction)
+        if signature == self.ball_signature:
+            return
+        self.ball_signature = signature
+        self.broadcast_message(create_ball_trajectory_message(ball.get_trajectory(), self.time))
+    
+    def ball_seen_at(self, seen_time):
+        """(x, y, is_active) of the ball at a past room time, rewinding at most MAX_HIT_REWIND"""
+        seen_time = max(seen_time, self.time - MAX_HIT_REWIND)
+        if seen_time >= self.time or not self.ball_history:
+            return None  # Nothing to rewind; use the live ball
+        
+        newer = None
+        for entry in reversed(self.ball_history):
+            if entry[0] <= seen_time:
+                if newer is None or entry[3] != newer[3]:
+                    return entry[1:]
+                # Blend between the two steps around seen_time
+                t = (seen_time - entry[0]) / (newer[0] - entry[0])
+                return (entry[1] + (newer[1] - entry[1]) * t, entry[2] + (newer[2] - entry[2]) * t, entry[3])
+            newer = entry
+        return self.ball_history[0][1:]  # Older than the buffer: the oldest we have
+    
+    def clock(self, now):
+        """Room time at perf_counter() `now`, extrapolated past the last tick"""
+        if self.last_tick is None:
+            return None  # Not anchored until the first tick
+        return self.time + (now - self.last_tick)
+    
+    def ping_players(self):
+        """Measure each client's round-trip time (see network/clock.py)"""
+        for client_socket in list(self.players):
+            self.send_to(client_socket, create_ping_message(time.perf_counter()).encode())
+    
+    def handle_ping(self, client_socket, ping_time):
+        """Answer a client's PING with the room clock, which snapshots and trajectories use"""
+        room_time = self.clock(time.perf_counter())
+        if room_time is not None:
+            self.send_to(client_socket, create_pong_message(ping_time, room_time).encode())
+    
+    def latency_stats(self):
+        """Round-trip time and jitter per player id, None until a PONG has arrived"""
+        return {info['id']: client_socket.clock.stats() for client_socket, info in self.players.items()}
+    
+    def acknowledge_snapshot(self, client_socket, seq):
+        """Record that a client holds snapshot `seq`, making it usable as a delta baseline"""
+        player_info = self.players.get(client_socket)
+        if player_info is None or seq not in self.snapshot_history:
+            return
+        if player_info['acked_seq'] is None or seq > player_info['acked_seq']:
+            player_info['acked_seq'] = seq
+    
+    def broadcast_game_state(self, game_state):
+        """Send each client a delta against its acknowledged baseline, or a keyframe"""
+        self.snapshot_seq += 1
+        seq = self.snapshot_seq
+        self.snapshot_history[seq] = game_state
+        if len(self.snapshot_history) > SNAPSHOT_HISTORY:
+            del self.snapshot_history[next(iter(self.snapshot_history))]
+        
+        keyframe_due = seq % KEYFRAME_INTERVAL == 0
+        payloads = {}  # baseline seq (None for keyframe) -> snapshot payload
+        encoded = {}  # (baseline seq, encoding) -> bytes shared by every client in the group
+        for client_socket, player_info in list(self.players.items()):
+            baseline = player_info['acked_seq']
+            if keyframe_due or baseline not in self.snapshot_history:
+                baseline = None
+            
+            key = (baseline, player_info['encoding'])
+            if key not in encoded:
+                if baseline not in payloads:
+                    if baseline is None:
+                        payloads[baseline] = make_keyframe(game_state, seq)
+                    else:
+                        payloads[baseline] = diff_game_state(
+                            self.snapshot_history[baseline], game_state, seq, baseline
+                        )
+                state_msg = create_game_state_message(payloads[baseline])
+                encoded[key] = self.encode_message(state_msg, player_info['encoding'])
+            
+            self.send_to(client_socket, encoded[key], snapshot=True)
+    
     def broadcast_message(self, message):
-        for client_socket in list(self.players.keys()):
-            try:
-                client_socket.send((message.to_json() + '\n').encode())
-            except:
-                # Remove disconnected client
-                self.remove_player(client_socket)
+        """Encode the message once per wire encoding and fan the bytes out to every client"""
+        encoded = {}  # wire encoding -> bytes
+        for client_socket, player_info in list(self.players.items()):
+            encoding = message.wire_encoding(player_info['encoding'])
+            if encoding not in encoded:
+                encoded[encoding] = self.encode_message(message, encoding)
+            self.send_to(client_socket, encoded[encoding])
+    
+    def encode_message(self, message, encoding):
+        start = time.perf_counter()
+        data = message.encode(encoding)
+        self.encode_time += time.perf_counter() - start
+        self.messages_encoded += 1
+        return data
+    
+    def send_to(self, client_socket, data, snapshot=False):
+        """Hand encoded bytes to a connection; its send never blocks the tick"""
+        try:
+            self.bytes_sent += client_socket.send(data, snapshot)
+        except SlowConsumerError as e:
+            print(f"Evicting slow client from room {self.room_id}: {e}")
+            self.evicted += 1
+            self.remove_player(client_socket)
+        except:
+            # Remove disconnected client
+            self.remove_player(client_socket)
+    
+    def queue_depths(self):
+        """Outbound queue depth per player id"""
+        return {info['id']: client_socket.queue_depth for client_socket, info in self.players.items()}
 
 class GameServer:
-    def __init__(self, host='localhost', port=12345):
-        self.host = host
-        self.port = port
+    def __init__(self, host='localhost', port=12345, udp=False, udp_loss=0.0, replay_dir=None):
+        self.init_state(host, port, udp, udp_loss, replay_dir)
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    
+    def init_state(self, host, port, udp, udp_loss, replay_dir):
+        """Rooms, UDP and tick state shared with AsyncGameServer; everything but the listener"""
+        self.host = host
+        self.port = port
+        self.udp_enabled = udp  # Offer clients a UDP channel for snapshots and actions
+        self.udp_loss = udp_loss  # Simulated outgoing datagram loss, for testing
+        self.udp_socket = None
+        self.udp_channel = None
+        self.udp_tokens = {}  # token -> connection
+        self.replay_dir = replay_dir  # Record every game as a replay file here (see models/replay.py)
+        if replay_dir:
+            os.makedirs(replay_dir, exist_ok=True)
         self.rooms = {}  # room_id -> GameRoom
+        self.connection_rooms = {}  # connection -> GameRoom it is playing in
+        self.rooms_lock = threading.RLock()  # Serializes joins and leaves with the tick closing rooms
         self.running = False
+        self.scheduler = TickScheduler()
+        self.tick_stats = deque(maxlen=TICK_STATS_WINDOW)  # (tick start, tick duration)
         
     def generate_room_id(self):
         """Generate a unique 4-character room ID"""
@@ -161,7 +402,14 @@ class GameServer:
     
     def start(self):
         self.socket.bind((self.host, self.port))
+        self.port = self.socket.getsockname()[1]  # Resolve port 0 to the real port
         self.socket.listen(5)
+        
+        if self.udp_enabled:
+            # Datagrams use the same port number as the TCP listener
+            self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.udp_socket.bind((self.host, self.port))
+            self.udp_channel = UdpChannel(self.udp_socket, self.udp_loss)
         self.running = True
         
         print(f"Game server started on {self.host}:{self.port}")
@@ -171,6 +419,11 @@ class GameServer:
         update_thread.daemon = True
         update_thread.start()
         
+        if self.udp_channel:
+            udp_thread = threading.Thread(target=self.udp_receive_loop)
+            udp_thread.daemon = True
+            udp_thread.start()
+        
         try:
             while self.running:
                 client_socket, address = self.socket.accept()
@@ -190,60 +443,189 @@ class GameServer:
     def stop(self):
         self.running = False
         self.socket.close()
+        if self.udp_socket:
+            self.udp_socket.close()
+        self.close_replays()
+    
+    def close_replays(self):
+        """Finish the replay files of games still in progress"""
+        for room in list(self.rooms.values()):
+            room.close_replay()
+    
+    def udp_receive_loop(self):
+        while self.running:
+            try:
+                datagram, address = self.udp_socket.recvfrom(UDP_MAX_DATAGRAM)
+            except OSError:
+                break
+            self.handle_datagram(datagram, address)
+    
+    def handle_datagram(self, datagram, address):
+        """Process PLAYER_ACTION / SNAPSHOT_ACK / UDP_HELLO datagrams from a registered client
+
+        Snapshots only move to UDP once the client acks our reply to its
+        UDP_HELLO; udp_snapshots() moves them back to TCP when its datagrams stop.
+        """
+        packet = self.udp_channel.accept(datagram)
+        if packet is None:
+            return
+        token, payload = packet
+        connection = self.udp_tokens.get(token)
+        if connection is None:
+            return
+        
+        for message in decode_frames(payload):
+            if message.type == MessageType.UDP_HELLO and not message.data.get('ack'):
+                # Answer, so the client can show that our datagrams reach it
+                self.udp_channel.send(NetworkMessage(MessageType.UDP_HELLO).encode(), address, token)
+                continue
+            # Anything else is only sent once the client receives our datagrams
+            connection.udp_heard = time.monotonic()
+            if message.type == MessageType.UDP_HELLO:
+                connection.udp_address = address  # From now on snapshots for this client go over UDP
+            elif message.type in (MessageType.PLAYER_ACTION, MessageType.SNAPSHOT_ACK):
+                self.process_message(connection, message)
+    
+    def udp_info(self, connection):
+        """Assign a UDP token to a connection; returns the fields to add to the join reply"""
+        if not self.udp_channel:
+            return {}
+        if connection.udp_token is None:
+            token = random.getrandbits(32)
+            while token == 0 or token in self.udp_tokens:
+                token = random.getrandbits(32)
+            connection.udp_token = token
+            connection.udp_channel = self.udp_channel
+            self.udp_tokens[token] = connection
+        return {'udp_port': self.port, 'udp_token': connection.udp_token}
+    
+    def forget_connection(self, connection):
+        """Drop every reference the server holds to a closed connection"""
+        with self.rooms_lock:
+            self.leave_room(connection)
+        self.udp_tokens.pop(connection.udp_token, None)
+        if self.udp_channel:
+            self.udp_channel.forget(connection.udp_token)
+    
+    def room_of(self, connection):
+        """Room the connection is playing in, or None"""
+        room = self.connection_rooms.get(connection)
+        if room is not None and connection not in room.players:
+            # The room dropped it (evicted or broken connection)
+            self.connection_rooms.pop(connection, None)
+            return None
+        return room
+    
+    def leave_room(self, connection):
+        """Take a connection out of its room, closing the room once nobody is left"""
+        room = self.connection_rooms.pop(connection, None)
+        if room is None:
+            return
+        room.remove_player(connection)
+        if not room.players:
+            self.remove_room(room)
+    
+    def remove_room(self, room, reason=None):
+        """Forget a room and every connection's entry for it"""
+        if self.rooms.get(room.room_id) is room:
+            del self.rooms[room.room_id]
+        for connection in list(room.players):
+            if self.connection_rooms.get(connection) is room:
+                del self.connection_rooms[connection]
+        room.close(reason)
+    
+    def update_rooms(self, steps):
+        """Step every room, then close the ones that emptied, finished or sat idle too long"""
+        for room in list(self.rooms.values()):
+            # A join waits for this room's step, so it can't land in a room being closed
+            with self.rooms_lock:
+                room.update_game(self.scheduler.dt, steps, self.scheduler.last_step_time)
+                if not room.players:
+                    # Everyone left or was evicted
+                    self.remove_room(room)
+                elif room.is_finished():
+                    print(f"Closing finished room {room.room_id}")
+                    self.remove_room(room, f"Game over: room {room.room_id} closed")
+                elif room.is_idle():
+                    print(f"Closing idle room {room.room_id}")
+                    self.remove_room(room, f"Room {room.room_id} closed after {ROOM_IDLE_TIMEOUT:.0f} s without play")
     
     def game_update_loop(self):
-        """Update all active games"""
+        """Update all active games at a fixed tick rate"""
         while self.running:
-            for room in list(self.rooms.values()):
-                room.update_game()
-            time.sleep(1/60)  # 60 FPS
+            tick_start = time.perf_counter()
+            steps = self.scheduler.due_steps(tick_start)
+            if steps:
+                self.update_rooms(steps)
+                self.tick_stats.append((tick_start, time.perf_counter() - tick_start))
+            time.sleep(self.scheduler.time_until_next_tick(time.perf_counter()))
     
     def handle_client(self, client_socket, address):
+        connection = ClientConnection(client_socket)
+        decoder = FrameDecoder()
         try:
-            buffer = ""
             while self.running:
-                data = client_socket.recv(1024).decode()
-                if not data:
+                messages = decoder.recv_into(client_socket)
+                if messages is None:
                     break
-                
-                buffer += data
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    message = NetworkMessage.from_json(line)
-                    if message:
-                        self.process_message(client_socket, message)
+                for message in messages:
+                    self.process_message(connection, message)
         except Exception as e:
             print(f"Error handling client {address}: {e}")
         finally:
             # Remove client from any room
-            for room in self.rooms.values():
-                room.remove_player(client_socket)
-            client_socket.close()
+            self.forget_connection(connection)
+            connection.close()
     
     def process_message(self, client_socket, message):
+        if message.type in (MessageType.CREATE_ROOM, MessageType.JOIN_ROOM, MessageType.LEAVE_ROOM):
+            with self.rooms_lock:
+                self.change_room(client_socket, message)
+        elif message.type == MessageType.PLAYER_ACTION:
+            self.handle_player_action(client_socket, message.data)
+        elif message.type == MessageType.SNAPSHOT_ACK:
+            self.handle_snapshot_ack(client_socket, message.data)
+        elif message.type == MessageType.PING:
+            self.handle_ping(client_socket, message.data)
+        elif message.type == MessageType.PONG:
+            self.handle_pong(client_socket, message.data)
+    
+    def change_room(self, client_socket, message):
+        """CREATE_ROOM / JOIN_ROOM / LEAVE_ROOM; called with rooms_lock held"""
         if message.type == MessageType.CREATE_ROOM:
             self.handle_create_room(client_socket, message.data)
         elif message.type == MessageType.JOIN_ROOM:
             self.handle_join_room(client_socket, message.data)
-        elif message.type == MessageType.PLAYER_ACTION:
-            self.handle_player_action(client_socket, message.data)
+        else:
+            self.leave_room(client_socket)
+    
+    def negotiate_encoding(self, data):
+        """Pick the snapshot encoding requested by the client, falling back to JSON"""
+        encoding = data.get('encoding', ENCODING_JSON)
+        return encoding if encoding in SUPPORTED_ENCODINGS else ENCODING_JSON
     
     def handle_create_room(self, client_socket, data):
+        # A connection plays in one room at a time
+        self.leave_room(client_socket)
         room_id = self.generate_room_id()
-        room = GameRoom(room_id)
+        room = GameRoom(room_id, replay_dir=self.replay_dir)
         self.rooms[room_id] = room
         
         player_name = data.get('player_name', 'Player')
-        room.add_player(client_socket, player_name)
+        encoding = self.negotiate_encoding(data)
+        room.add_player(client_socket, player_name, encoding)
+        self.connection_rooms[client_socket] = room
         
         response = NetworkMessage(MessageType.ROOM_CREATED, {
             'room_id': room_id,
             'player_id': 0,
-            'players_count': len(room.players)
+            'players_count': len(room.players),
+            'encoding': encoding,
+            **self.udp_info(client_socket)
         })
         
         try:
-            client_socket.send((response.to_json() + '\n').encode())
+            client_socket.send(response.encode())
             # Send initial room update
             room.send_room_update()
         except:
@@ -256,31 +638,37 @@ class GameServer:
         if room_id not in self.rooms:
             response = NetworkMessage(MessageType.ROOM_NOT_FOUND)
             try:
-                client_socket.send((response.to_json() + '\n').encode())
+                client_socket.send(response.encode())
             except:
                 pass
             return
         
         room = self.rooms[room_id]
+        if client_socket in room.players:
+            return  # Already playing here
         if len(room.players) >= room.max_players:
             response = NetworkMessage(MessageType.ROOM_FULL)
             try:
-                client_socket.send((response.to_json() + '\n').encode())
+                client_socket.send(response.encode())
             except:
                 pass
             return
         
-        player_id = len(room.players)
-        room.add_player(client_socket, player_name)
+        self.leave_room(client_socket)
+        encoding = self.negotiate_encoding(data)
+        room.add_player(client_socket, player_name, encoding)
+        self.connection_rooms[client_socket] = room
         
         response = NetworkMessage(MessageType.ROOM_JOINED, {
             'room_id': room_id,
-            'player_id': player_id,
-            'players_count': len(room.players)
+            'player_id': room.players[client_socket]['id'],
+            'players_count': len(room.players),
+            'encoding': encoding,
+            **self.udp_info(client_socket)
         })
         
         try:
-            client_socket.send((response.to_json() + '\n').encode())
+            client_socket.send(response.encode())
             # Send room update to show all players
             room.send_room_update()
         except:
@@ -288,12 +676,25 @@ class GameServer:
     
     def handle_player_action(self, client_socket, data):
         action = data.get('action')
+        seq = data.get('seq')
+        seen_time = data.get('time')
         
-        # Find which room this client is in
-        for room in self.rooms.values():
-            if client_socket in room.players:
-                room.handle_player_action(client_socket, action)
-                break
+        room = self.room_of(client_socket)
+        if room:
+            room.handle_player_action(client_socket, action, seq, seen_time)
+
+    def handle_snapshot_ack(self, client_socket, data):
+        room = self.room_of(client_socket)
+        if room:
+            room.acknowledge_snapshot(client_socket, data.get('seq'))
+    
+    def handle_ping(self, client_socket, data):
+        room = self.room_of(client_socket)
+        if room:
+            room.handle_ping(client_socket, data.get('time'))
+    
+    def handle_pong(self, client_socket, data):
+        client_socket.clock.add_sample(data.get('echo'), data.get('time'), time.perf_counter())
 
 if __name__ == "__main__":
     server = GameServer()
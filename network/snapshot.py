@@ -0,0 +1,46 @@
+"""
+Delta compression for GAME_STATE snapshots
+
+A keyframe carries the full serialized state. A delta carries only the
+fields that changed since a baseline snapshot the client has acknowledged,
+so immutable fields (id, color) and resting players are not re-sent.
+"""
+
+# Fields compared when building a delta; anything else only travels in keyframes
+DELTA_PLAYER_FIELDS = ('state', 'x', 'y', 'stick_angle', 'swing_target', 'action_seq')
+
+def make_keyframe(state, seq):
+    """Full snapshot that doesn't depend on any baseline"""
+    keyframe = dict(state)
+    keyframe['seq'] = seq
+    keyframe['baseline'] = None
+    return keyframe
+
+def diff_game_state(baseline, state, seq, baseline_seq):
+    """Build a delta holding only what changed between baseline and state"""
+    players = []
+    for old, new in zip(baseline['players'], state['players']):
+        changes = {key: new[key] for key in DELTA_PLAYER_FIELDS if new[key] != old[key]}
+        if changes:
+            changes['id'] = new['id']
+            players.append(changes)
+
+    delta = {'seq': seq, 'baseline': baseline_seq, 'time': state['time'], 'players': players}
+
+    if state['game_over'] != baseline['game_over']:
+        delta['game_over'] = state['game_over']
+    return delta
+
+def apply_snapshot_delta(baseline, delta):
+    """Rebuild the full state described by a delta against its baseline"""
+    players = {player['id']: dict(player) for player in baseline['players']}
+    for changes in delta.get('players', []):
+        players.setdefault(changes['id'], {}).update(changes)
+
+    return {
+        'seq': delta['seq'],
+        'baseline': None,
+        'time': delta['time'],
+        'players': [players[player_id] for player_id in sorted(players)],
+        'game_over': delta.get('game_over', baseline['game_over'])
+    }
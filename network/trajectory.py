@@ -0,0 +1,51 @@
+"""
+Client-side ball driven by BALL_TRAJECTORY events
+
+Between hits the ball circles the planet at a constant angular velocity,
+so the server only announces (angle, speed, direction, spawn state) with
+the room time whenever they change. The client keeps the recent events
+and evaluates Ball.set_trajectory at whatever server time it is drawing,
+so the ball is not part of the per-tick snapshots at all.
+"""
+from collections import deque
+from models.ball import Ball
+
+# Events kept so a change that arrives ahead of the (delayed) render time isn't applied early
+TRAJECTORY_HISTORY = 8
+
+class BallTrajectory:
+    def __init__(self):
+        self.ball = Ball()
+        self.events = deque(maxlen=TRAJECTORY_HISTORY)  # trajectory dicts with 'time', oldest first
+
+    def __len__(self):
+        return len(self.events)
+
+    def clear(self):
+        self.events.clear()
+
+    def push(self, trajectory):
+        self.events.append(trajectory)
+
+    def state_at(self, server_time):
+        """Ball dict (as the renderer expects it) at a server time, or None before the first event"""
+        events = list(self.events)  # The network thread may push while we render
+        if not events:
+            return None
+
+        # Latest change at or before server_time; the first one if we're drawing earlier than all
+        current = events[0]
+        for event in events:
+            if event['time'] > server_time:
+                break
+            current = event
+
+        ball = self.ball
+        ball.set_trajectory(current, max(0.0, server_time - current['time']))
+        return {
+            'x': ball.x,
+            'y': ball.y,
+            'angle': ball.angle,
+            'is_active': ball.is_active,
+            'spawn_timer': ball.countdown
+        }
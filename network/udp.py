@@ -0,0 +1,50 @@
+"""
+Unreliable UDP channel for GAME_STATE snapshots and player actions
+
+Room management stays on the TCP stream. Datagrams carry the sender's
+token and a sequence number so the receiver can drop stale or duplicate
+packets instead of waiting for retransmits (no head-of-line blocking).
+"""
+import random
+import struct
+from config.constants import *
+
+# Datagram layout: token (I) | sequence number (I) | encoded message frames (see network/protocol.py)
+UDP_HEADER = struct.Struct('<II')
+
+class UdpChannel:
+    """Sequenced datagram sender/receiver on top of anything with sendto()"""
+    def __init__(self, transport, loss_rate=0.0):
+        self.transport = transport  # socket.socket or asyncio.DatagramTransport
+        self.loss_rate = loss_rate  # Fraction of outgoing datagrams dropped on purpose (testing)
+        self.send_seq = 0
+        self.last_seq = {}  # token -> newest sequence number received
+        self.sent = 0
+        self.lost = 0
+        self.received = 0
+        self.stale = 0
+
+    def send(self, data, address, token):
+        self.send_seq += 1
+        self.sent += 1
+        if self.loss_rate and random.random() < self.loss_rate:
+            self.lost += 1
+            return len(data)
+        self.transport.sendto(UDP_HEADER.pack(token, self.send_seq) + data, address)
+        return len(data)
+
+    def accept(self, datagram):
+        """Return (token, payload), or None for malformed, stale or duplicate datagrams"""
+        if len(datagram) < UDP_HEADER.size:
+            return None
+        token, seq = UDP_HEADER.unpack_from(datagram, 0)
+        if seq <= self.last_seq.get(token, 0):
+            self.stale += 1
+            return None
+        self.last_seq[token] = seq
+        self.received += 1
+        return token, datagram[UDP_HEADER.size:]
+
+    def forget(self, token):
+        """Drop the sequence state of a token whose connection is gone"""
+        self.last_seq.pop(token, None)
@@ -6,28 +6,51 @@ Không cần server riêng!
 import pygame
 import sys
 import socket
+import selectors
 import threading
-import json
 import random
 import string
 import time
+from collections import deque
 from models.game import Game
+from models.geometry import stick_direction
+from network.protocol import FrameDecoder, json_frame, decode_json_frame
+from network.scheduler import TickScheduler
+from network.input_queue import InputQueue
 from views.game_renderer import GameRenderer
 from config.constants import *
 
+class P2PPeer:
+    """Một người chơi đã kết nối tới host: socket, bộ đọc frame và dữ liệu chờ gửi"""
+    def __init__(self, sock):
+        self.socket = sock
+        self.decoder = FrameDecoder(decode_json_frame)
+        self.outbound = bytearray()  # Bytes the socket has not taken yet
+        self.player_id = None  # Set once the join request is accepted
+
 class P2PHost:
-    """Host game - người tạo phòng"""
+    """Host game - người tạo phòng
+
+    Accepting, reading peers, simulating and sending state all run on one
+    selectors loop in its own thread, at a fixed tick (TickScheduler) that
+    does not depend on how fast the host's own window renders. The render
+    thread only reads `game`, hands work to the loop through `calls` and
+    queues the host's own actions on `inputs` like everyone else's.
+    """
     def __init__(self, room_code, player_name):
         self.room_code = room_code
         self.player_name = player_name
-        self.players = {0: player_name}  # player_id -> name
-        self.client_sockets = {}  # player_id -> socket
+        self.players = {0: player_name}  # player_id -> name; replaced, never mutated, so the render thread can read it
+        self.peers = {}  # player_id -> P2PPeer
         self.server_socket = None
+        self.selector = None
         self.running = False
         self.game = None
         self.game_started = False
-        self.player_actions = {}  # player_id -> latest action
-        self.action_lock = threading.Lock()  # Lock for thread-safe access
+        self.inputs = InputQueue()  # Every action from the host and peers, applied in order at the next tick
+        self.calls = deque()  # Functions other threads hand to the host loop (deque appends are thread-safe)
+        self.scheduler = TickScheduler()
+        self.tick_stats = deque(maxlen=TICK_STATS_WINDOW)  # (tick start, tick duration)
         
     def start(self, port=12345):
         """Khởi động host server"""
@@ -37,93 +60,164 @@ class P2PHost:
             # Bind to all interfaces (0.0.0.0) to accept connections from LAN
             self.server_socket.bind(('0.0.0.0', port))
             self.server_socket.listen(3)  # Chấp nhận tối đa 3 người join (host + 3 = 4)
+            self.server_socket.setblocking(False)
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.server_socket, selectors.EVENT_READ)
             self.running = True
             
             print(f"Host started on port {port}")
             
-            # Thread để chấp nhận kết nối
-            accept_thread = threading.Thread(target=self.accept_connections)
-            accept_thread.daemon = True
-            accept_thread.start()
+            # Một thread duy nhất cho mạng và mô phỏng
+            loop_thread = threading.Thread(target=self.serve)
+            loop_thread.daemon = True
+            loop_thread.start()
             
             return True, port
         except Exception as e:
             print(f"Failed to start host: {e}")
             return False, None
     
-    def accept_connections(self):
-        """Chấp nhận kết nối từ các người chơi"""
-        while self.running and len(self.players) < 4:
-            try:
-                self.server_socket.settimeout(1.0)
-                client_socket, addr = self.server_socket.accept()
-                
-                # Nhận tên người chơi
-                data = client_socket.recv(1024).decode()
-                msg = json.loads(data)
-                
-                if msg['type'] == 'join' and msg['room_code'] == self.room_code:
-                    player_id = len(self.players)
-                    player_name = msg['player_name']
-                    
-                    self.players[player_id] = player_name
-                    self.client_sockets[player_id] = client_socket
-                    
-                    # Gửi xác nhận
-                    response = {
-                        'type': 'joined',
-                        'player_id': player_id,
-                        'players': self.players
-                    }
-                    client_socket.send((json.dumps(response) + '\n').encode())
-                    
-                    # Broadcast cập nhật phòng
-                    self.broadcast_room_update()
-                    
-                    # Bắt đầu nhận tin nhắn từ client này
-                    client_thread = threading.Thread(target=self.handle_client, args=(client_socket, player_id))
-                    client_thread.daemon = True
-                    client_thread.start()
-                    
-                    print(f"Player {player_id} ({player_name}) joined. Total players: {len(self.players)}")
-                    
-                    # Nếu đủ 2 người, có thể bắt đầu game (tối đa 4)
-                    # Tự động start khi đủ 4 người, hoặc host có thể start thủ công
-                    if len(self.players) == 4:
-                        time.sleep(0.5)  # Đợi chút để mọi người nhận được room update
-                        self.start_game()
-                        
-            except socket.timeout:
-                continue
-            except Exception as e:
-                print(f"Error accepting connection: {e}")
-    
-    def handle_client(self, client_socket, player_id):
-        """Xử lý tin nhắn từ một client"""
-        buffer = ""
+    def serve(self):
+        """Host loop: run the ticks that are due, then wait for sockets until the next one"""
         try:
             while self.running:
-                data = client_socket.recv(1024).decode()
-                if not data:
-                    break
-                
-                buffer += data
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    msg = json.loads(line)
-                    
-                    if msg['type'] == 'action':
-                        with self.action_lock:
-                            self.player_actions[player_id] = msg['action']
-                        print(f"Received action from player {player_id}: {msg['action']}")
-                        
+                tick_start = time.perf_counter()
+                steps = self.scheduler.due_steps(tick_start)
+                if steps:
+                    self.update_game(steps)
+                    self.tick_stats.append((tick_start, time.perf_counter() - tick_start))
+                timeout = self.scheduler.time_until_next_tick(time.perf_counter())
+                for key, events in self.selector.select(timeout):
+                    if key.data is None:
+                        self.accept_connection()
+                    else:
+                        if events & selectors.EVENT_READ:
+                            self.read_peer(key.data)
+                        if events & selectors.EVENT_WRITE:
+                            self.flush(key.data)
         except Exception as e:
-            print(f"Client {player_id} disconnected: {e}")
+            if self.running:
+                print(f"Host loop stopped: {e}")
         finally:
-            if player_id in self.client_sockets:
-                del self.client_sockets[player_id]
-            if player_id in self.players:
-                del self.players[player_id]
+            for peer in list(self.peers.values()):
+                peer.socket.close()
+            self.selector.close()
+            self.server_socket.close()
+    
+    def accept_connection(self):
+        """Chấp nhận kết nối từ một người chơi"""
+        try:
+            client_socket, addr = self.server_socket.accept()
+        except (BlockingIOError, OSError):
+            return
+        if len(self.players) >= 4:
+            client_socket.close()
+            return
+        client_socket.setblocking(False)
+        # Send each tick's state now instead of letting Nagle hold it for the peer's delayed ACK
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        peer = P2PPeer(client_socket)
+        self.selector.register(client_socket, selectors.EVENT_READ, peer)
+    
+    def read_peer(self, peer):
+        """Đọc mọi frame đã đến từ một người chơi"""
+        try:
+            messages = peer.decoder.recv_into(peer.socket)
+        except BlockingIOError:
+            return
+        except Exception as e:
+            print(f"Client {peer.player_id} disconnected: {e}")
+            messages = None
+        if messages is None:
+            self.drop_peer(peer)
+            return
+        
+        for msg in messages:
+            if not self.valid_message(peer, msg):
+                # Một frame hỏng chỉ ngắt người gửi, không làm dừng cả host loop
+                print(f"Dropping client {peer.player_id}: malformed message")
+                self.drop_peer(peer)
+                return
+            if peer.player_id is None:
+                # Tin nhắn đầu tiên phải là yêu cầu join
+                if not self.join_peer(peer, msg):
+                    self.drop_peer(peer)
+                    return
+            elif msg['type'] == 'action':
+                self.inputs.push(self.scheduler.ticks, peer.player_id, msg['action'])
+                print(f"Received action from player {peer.player_id}: {msg['action']}")
+    
+    def valid_message(self, peer, msg):
+        """Whether a message is an object with the fields the host reads from it"""
+        if not isinstance(msg, dict):
+            return False  # Not JSON, or JSON that is not an object
+        if peer.player_id is None:
+            return isinstance(msg.get('player_name'), str)
+        if msg.get('type') == 'action':
+            return msg.get('action') in ('hit', 'dodge')
+        return True
+    
+    def join_peer(self, peer, msg):
+        if msg.get('type') != 'join' or msg.get('room_code') != self.room_code or len(self.players) >= 4:
+            return False
+        player_id = min(set(range(4)) - self.players.keys())  # Lowest seat free, a dropped peer's included
+        player_name = msg['player_name']
+        peer.player_id = player_id
+        self.players = {**self.players, player_id: player_name}
+        self.peers[player_id] = peer
+        
+        # Gửi xác nhận
+        response = {
+            'type': 'joined',
+            'player_id': player_id,
+            'players': self.players
+        }
+        self.send(peer, json_frame(response))
+        
+        # Broadcast cập nhật phòng
+        self.broadcast_room_update()
+        print(f"Player {player_id} ({player_name}) joined. Total players: {len(self.players)}")
+        
+        # Nếu đủ 2 người, có thể bắt đầu game (tối đa 4)
+        # Tự động start khi đủ 4 người, hoặc host có thể start thủ công
+        if len(self.players) == 4:
+            self.begin_game()
+        return True
+    
+    def drop_peer(self, peer):
+        try:
+            self.selector.unregister(peer.socket)
+        except (KeyError, ValueError):
+            pass
+        peer.socket.close()
+        if peer.player_id is not None and self.peers.get(peer.player_id) is peer:
+            del self.peers[peer.player_id]
+            self.players = {pid: name for pid, name in self.players.items() if pid != peer.player_id}
+    
+    def send(self, peer, data):
+        """Queue bytes for a peer and write what the socket takes now"""
+        peer.outbound += data
+        if len(peer.outbound) > P2P_OUTBOUND_LIMIT:
+            print(f"Dropping player {peer.player_id}: {len(peer.outbound)} bytes unsent")
+            self.drop_peer(peer)
+            return
+        self.flush(peer)
+    
+    def flush(self, peer):
+        try:
+            sent = peer.socket.send(peer.outbound)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self.drop_peer(peer)
+            return
+        del peer.outbound[:sent]
+        # Only ask for write readiness while something is left to send
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if peer.outbound else 0)
+        try:
+            self.selector.modify(peer.socket, events, peer)
+        except (KeyError, ValueError):
+            pass
     
     def broadcast_room_update(self):
         """Gửi cập nhật phòng cho tất cả người chơi"""
@@ -134,7 +228,12 @@ class P2PHost:
         self.broadcast(msg)
     
     def start_game(self):
-        """Bắt đầu game"""
+        """Bắt đầu game ở tick tiếp theo (gọi được từ thread vẽ)"""
+        self.calls.append(self.begin_game)
+    
+    def begin_game(self):
+        if self.game_started:
+            return
         self.game = Game()
         self.game_started = True
         print("Host: Starting game with players:", self.players)
@@ -144,40 +243,26 @@ class P2PHost:
     
     def broadcast(self, msg):
         """Gửi tin nhắn cho tất cả clients"""
-        data = json.dumps(msg) + '\n'
-        for client_socket in self.client_sockets.values():
-            try:
-                client_socket.send(data.encode())
-            except:
-                pass
+        data = json_frame(msg)  # Encode once, shared by every client
+        for peer in list(self.peers.values()):
+            self.send(peer, data)
     
-    def update_game(self, dt):
-        """Cập nhật game và gửi state cho clients"""
+    def update_game(self, steps=1):
+        """Chạy `steps` bước cố định và gửi state cho clients"""
+        # Việc do thread vẽ gửi sang (bắt đầu game, action của host)
+        while self.calls:
+            self.calls.popleft()()
         if not self.game_started or not self.game:
             return
         
         try:
-            # Xử lý actions của người chơi
-            with self.action_lock:
-                actions_to_process = self.player_actions.copy()
-                self.player_actions.clear()
-            
-            for player_id, action in actions_to_process.items():
-                if player_id < len(self.game.players):
-                    player = self.game.players[player_id]
-                    print(f"Processing action for player {player_id}: {action}")
-                    if action == 'hit':
-                        result = player.hit_ball(self.game.ball)
-                        print(f"  Hit result: {result}")
-                    elif action == 'dodge':
-                        player.start_dodge()
-                        print(f"  Dodge started")
-            
-            # Xử lý action của host (player 0)
-            # (Sẽ được xử lý từ controller)
+            # Xử lý actions của mọi người chơi (kể cả host), theo thứ tự cố định
+            for player_id, action in self.inputs.drain():
+                self.apply_action(player_id, action)
             
             # Update game
-            self.game.update(dt)
+            for _ in range(steps):
+                self.game.update(self.scheduler.dt)
             
             # Tạo game state và broadcast
             game_state = self.create_game_state()
@@ -191,6 +276,17 @@ class P2PHost:
             import traceback
             traceback.print_exc()
     
+    def apply_action(self, player_id, action):
+        if self.game_started and self.game and player_id < len(self.game.players):
+            player = self.game.players[player_id]
+            print(f"Processing action for player {player_id}: {action}")
+            if action == 'hit':
+                result = player.hit_ball(self.game.ball)
+                print(f"  Hit result: {result}")
+            elif action == 'dodge':
+                player.start_dodge()
+                print(f"  Dodge started")
+    
     def create_game_state(self):
         """Tạo game state để gửi cho clients"""
         players_data = []
@@ -224,21 +320,16 @@ class P2PHost:
         }
     
     def handle_host_action(self, action):
-        """Xử lý action của host (player 0)"""
-        if self.game_started and self.game and len(self.game.players) > 0:
-            player = self.game.players[0]
-            if action == 'hit':
-                player.hit_ball(self.game.ball)
-            elif action == 'dodge':
-                player.start_dodge()
+        """Xử lý action của host (player 0) ở tick tiếp theo, cùng hàng đợi với các peer"""
+        self.inputs.push(self.scheduler.ticks, 0, action)
+    
+    def latency_stats(self):
+        """Input-to-apply delay per player id (see network/input_queue.py)"""
+        return self.inputs.latency_stats()
     
     def stop(self):
-        """Dừng host"""
+        """Dừng host; host loop đóng các socket khi thoát"""
         self.running = False
-        if self.server_socket:
-            self.server_socket.close()
-        for socket in self.client_sockets.values():
-            socket.close()
 
 
 class P2PClient:
@@ -250,6 +341,7 @@ class P2PClient:
         self.players = {}
         self.game_state = None
         self.game_started = False
+        self.decoder = None  # FrameDecoder of the connection to the host
         
     def connect(self, host_ip, port, room_code, player_name):
         """Kết nối đến host"""
@@ -257,6 +349,7 @@ class P2PClient:
             print(f"Attempting to connect to {host_ip}:{port}...")
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.settimeout(10)  # 10 second timeout
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Actions go out at once
             self.socket.connect((host_ip, port))
             print("Connected!")
             
@@ -266,19 +359,22 @@ class P2PClient:
                 'room_code': room_code,
                 'player_name': player_name
             }
-            self.socket.send(json.dumps(msg).encode())
+            self.socket.sendall(json_frame(msg))
             print("Join request sent")
             
             # Nhận xác nhận
-            data = self.socket.recv(1024).decode()
-            print(f"Received: {data}")
-            response = json.loads(data.strip())
+            self.decoder = FrameDecoder(decode_json_frame)
+            messages = self.decoder.receive(self.socket) or [{'type': 'closed'}]
+            response = messages[0]
+            print(f"Received: {response}")
             
             if response['type'] == 'joined':
                 self.player_id = response['player_id']
                 self.players = {int(k): v for k, v in response['players'].items()}
                 self.connected = True
                 print(f"Joined as player {self.player_id}")
+                for msg in messages[1:]:
+                    self.handle_message(msg)  # Sent right behind the reply
                 
                 # Remove timeout for ongoing communication
                 self.socket.settimeout(None)
@@ -308,30 +404,15 @@ class P2PClient:
     
     def receive_messages(self):
         """Nhận tin nhắn từ host"""
-        buffer = ""
         try:
             while self.connected:
-                data = self.socket.recv(4096).decode()
-                if not data:
+                messages = self.decoder.recv_into(self.socket)
+                if messages is None:
                     print("Connection closed by host")
                     break
                 
-                buffer += data
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    try:
-                        msg = json.loads(line)
-                        
-                        if msg['type'] == 'room_update':
-                            self.players = {int(k): v for k, v in msg['players'].items()}
-                        elif msg['type'] == 'game_start':
-                            self.game_started = True
-                            print("Game started!")
-                        elif msg['type'] == 'game_state':
-                            self.game_state = msg['state']
-                    except json.JSONDecodeError as e:
-                        print(f"JSON decode error: {e}, line: {line}")
-                        continue
+                for msg in messages:
+                    self.handle_message(msg)
                         
         except socket.timeout:
             print("Connection lost: timed out")
@@ -344,6 +425,15 @@ class P2PClient:
         finally:
             self.connected = False
     
+    def handle_message(self, msg):
+        if msg['type'] == 'room_update':
+            self.players = {int(k): v for k, v in msg['players'].items()}
+        elif msg['type'] == 'game_start':
+            self.game_started = True
+            print("Game started!")
+        elif msg['type'] == 'game_state':
+            self.game_state = msg['state']
+    
     def send_action(self, action):
         """Gửi action cho host"""
         if self.connected:
@@ -352,7 +442,7 @@ class P2PClient:
                 'action': action
             }
             try:
-                self.socket.send((json.dumps(msg) + '\n').encode())
+                self.socket.sendall(json_frame(msg))
             except:
                 self.connected = False
     
@@ -624,7 +714,7 @@ class P2PGameController:
     def run(self):
         """Main loop"""
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0
+            self.clock.tick(FPS)
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -649,9 +739,7 @@ class P2PGameController:
                 elif self.mode == 'client' and self.client.game_started:
                     self.current_view = "game"
             
-            if self.current_view == "game":
-                if self.mode == 'host':
-                    self.host.update_game(dt)
+            # The host simulates on its own loop (P2PHost.serve), not once per frame here
             
             # Draw
             if self.current_view == "menu":
@@ -705,7 +793,6 @@ class P2PGameController:
         
         # Draw players
         from models.player_state import PlayerState
-        import math
         
         for p in state['players']:
             if p['state'] == PlayerState.ELIMINATED.value:
@@ -736,18 +823,9 @@ class P2PGameController:
                 
                 # Draw stick
                 stick_length = 35
-                if p['id'] == 0:
-                    base_angle = 0
-                elif p['id'] == 1:
-                    base_angle = math.pi/2
-                elif p['id'] == 2:
-                    base_angle = math.pi
-                else:
-                    base_angle = -math.pi/2
-                
-                stick_angle = base_angle + math.radians(p['stick_angle'])
-                stick_end_x = p['x'] + stick_length * math.cos(stick_angle)
-                stick_end_y = p['y'] + stick_length * math.sin(stick_angle)
+                dx, dy = stick_direction(p['id'], p['stick_angle'])
+                stick_end_x = p['x'] + stick_length * dx
+                stick_end_y = p['y'] + stick_length * dy
                 pygame.draw.line(self.screen, BLACK, (x, y), 
                                (int(stick_end_x), int(stick_end_y)), 4)
         
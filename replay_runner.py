@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Replay runner - re-simulates recorded games offline and checks them
+
+Usage: python replay_runner.py replays/*.jsonl.gz
+(record games with GameServer(replay_dir='replays'), see models/replay.py)
+"""
+import sys
+import time
+from models.replay import read_replay, replay_inputs, state_digest
+
+def main():
+    paths = sys.argv[1:]
+    if not paths:
+        print(__doc__.strip())
+        sys.exit(2)
+
+    failures = 0
+    total_ticks = 0
+    start = time.perf_counter()
+    for path in paths:
+        # One read of the file: its inputs generator closes it when exhausted
+        header, inputs, end = read_replay(path)
+        game, end = replay_inputs(header, inputs, end)
+        total_ticks += game.tick
+        winner = f"player {game.winner.id + 1}" if game.winner else "no winner"
+        if not end:
+            status = "cut off (no end line)"
+        elif game.tick == end['end'] and state_digest(game) == end['state']:
+            status = "OK"
+        else:
+            status = f"MISMATCH (recorded winner {end['winner']}, end tick {end['end']})"
+            failures += 1
+        print(f"{path}: room {header.get('room', '-')}, {game.tick} ticks, {winner} - {status}")
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{len(paths)} replays, {total_ticks / max(elapsed, 1e-9):,.0f} ticks/s, {failures} mismatched")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,63 @@ import pygame
 import math
 from config.constants import *
 from models.player_state import PlayerState
+from models.geometry import stick_direction
+
+INSTRUCTIONS = [
+    "Player 1 (Red): Q=Hit, A=Dodge",
+    "Player 2 (Green): W=Hit, S=Dodge", 
+    "Player 3 (Blue): E=Hit, D=Dodge",
+    "Player 4 (Yellow): R=Hit, F=Dodge"
+]
+ONLINE_CONTROLS = "Your controls: SPACE/UP = Hit, DOWN/ENTER = Dodge"
+SPRITE_KEYS = [(255, 0, 255), (0, 255, 255)]  # Transparent sprite pixels; the second if a circle is the first colour
 
 class GameRenderer:
     def __init__(self):
         self.font = pygame.font.Font(None, 48)
         self.small_font = pygame.font.Font(None, 24)
+        self.text_cache = {}  # (font, text, color) -> rendered surface, oldest first
+        self.sprites = {}  # (color, radius, width) -> circle on a colorkeyed surface
+        self.backgrounds = {}  # Static layer name -> planet and fixed text, drawn once
+    
+    def text(self, font, text, color):
+        """font.render(text, True, color), rendered once and reused"""
+        key = (font, text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            if len(self.text_cache) >= TEXT_CACHE_SIZE:
+                del self.text_cache[next(iter(self.text_cache))]  # RTT readouts would grow it forever
+            surface = self.text_cache[key] = font.render(text, True, color)
+        return surface
+    
+    def circle(self, screen, color, center, radius, width=0):
+        """pygame.draw.circle, blitted from a sprite drawn the first time it is needed"""
+        color = tuple(color[:3])  # The screen has no alpha channel, so draw.circle ignored it anyway
+        key = (color, radius, width)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            colorkey = SPRITE_KEYS[color == SPRITE_KEYS[0]]
+            size = 2 * radius + 3  # A pixel of margin on each side, so nothing the circle touches is clipped
+            sprite = pygame.Surface((size, size), 0, screen)
+            sprite.fill(colorkey)
+            pygame.draw.circle(sprite, color, (radius + 1, radius + 1), radius, width)
+            sprite.set_colorkey(colorkey, pygame.RLEACCEL)  # Blits copy only the circle's pixels
+            self.sprites[key] = sprite
+        screen.blit(sprite, (center[0] - radius - 1, center[1] - radius - 1))
+    
+    def draw_background(self, screen, draw_static):
+        """Clear the screen and blit the planet plus whatever draw_static adds, composited once"""
+        background = self.backgrounds.get(draw_static.__name__)
+        if background is None:
+            background = pygame.Surface(screen.get_size(), 0, screen)
+            background.fill(WHITE)
+            self.draw_planet(background)
+            draw_static(background)
+            # White is the screen's own colour: blitting skips it and copies only the drawn pixels
+            background.set_colorkey(WHITE, pygame.RLEACCEL)
+            self.backgrounds[draw_static.__name__] = background
+        screen.fill(WHITE)
+        screen.blit(background, (0, 0))
     
     def draw_planet(self, screen):
         """Draw the planet"""
@@ -22,30 +74,19 @@ class GameRenderer:
             
         if player.state == PlayerState.DODGING:
             # Draw as smaller circle when dodging (underground)
-            pygame.draw.circle(screen, player.color, (int(player.x), int(player.y)), PLAYER_RADIUS // 2)
+            self.circle(screen, player.color, (int(player.x), int(player.y)), PLAYER_RADIUS // 2)
         else:
             # Draw player
-            pygame.draw.circle(screen, player.color, (int(player.x), int(player.y)), PLAYER_RADIUS)
+            self.circle(screen, player.color, (int(player.x), int(player.y)), PLAYER_RADIUS)
             
             # Draw stick with swing animation
             if player.state in [PlayerState.STANDING, PlayerState.SWINGING, PlayerState.FLYING_OFF]:
                 stick_length = 35  # Made longer for larger players
                 
-                # Set base angle based on player position
-                if player.id == 0:  # Player 1 (bottom) - horizontal, pointing right
-                    base_angle = 0  # 0 degrees (right)
-                elif player.id == 1:  # Player 2 (left) - vertical, pointing up
-                    base_angle = math.pi/2  # 90 degrees (up)
-                elif player.id == 2:  # Player 3 (top) - horizontal, pointing left
-                    base_angle = math.pi  # 180 degrees (left)
-                elif player.id == 3:  # Player 4 (right) - vertical, pointing down
-                    base_angle = -math.pi/2  # -90 degrees (down)
-                
-                swing_offset = math.radians(player.stick_angle)
-                stick_angle = base_angle + swing_offset
-                
-                stick_end_x = player.x + stick_length * math.cos(stick_angle)
-                stick_end_y = player.y + stick_length * math.sin(stick_angle)
+                # Resting direction of the player's seat, turned by the swing
+                dx, dy = stick_direction(player.id, player.stick_angle)
+                stick_end_x = player.x + stick_length * dx
+                stick_end_y = player.y + stick_length * dy
                 pygame.draw.line(screen, BLACK, (int(player.x), int(player.y)), 
                                (int(stick_end_x), int(stick_end_y)), 4)  # Thicker stick too
         
@@ -53,10 +94,10 @@ class GameRenderer:
         if player.state == PlayerState.STANDING:
             if player.hit_cooldown <= 0:
                 # Normal hit range indicator when ready to hit
-                pygame.draw.circle(screen, (*player.color, 50), (int(player.x), int(player.y)), HIT_RANGE, 2)
+                self.circle(screen, (*player.color, 50), (int(player.x), int(player.y)), HIT_RANGE, 2)
             else:
                 # Dimmed hit range indicator during cooldown
-                pygame.draw.circle(screen, (*player.color, 20), (int(player.x), int(player.y)), HIT_RANGE, 1)
+                self.circle(screen, (*player.color, 20), (int(player.x), int(player.y)), HIT_RANGE, 1)
                 # Small cooldown indicator
                 cooldown_progress = player.hit_cooldown / HIT_COOLDOWN
                 pygame.draw.arc(screen, (255, 100, 100), 
@@ -71,64 +112,56 @@ class GameRenderer:
             # Draw ball with pulsing effect during countdown
             pulse = abs(math.sin(pygame.time.get_ticks() * 0.01))
             radius = BALL_RADIUS + int(pulse * 5)
-            pygame.draw.circle(screen, (255, 100, 100), (int(pos[0]), int(pos[1])), radius)
+            self.circle(screen, (255, 100, 100), (int(pos[0]), int(pos[1])), radius)
             
             # Draw countdown timer
             countdown = int(ball.spawn_timer) + 1
-            text = self.font.render(str(countdown), True, BLACK)
+            text = self.text(self.font, str(countdown), BLACK)
             text_rect = text.get_rect(center=(int(pos[0]), int(pos[1]) - 30))
             screen.blit(text, text_rect)
         else:
             # Draw normal moving ball
-            pygame.draw.circle(screen, BLACK, (int(pos[0]), int(pos[1])), BALL_RADIUS)
+            self.circle(screen, BLACK, (int(pos[0]), int(pos[1])), BALL_RADIUS)
     
-    def draw_ui(self, screen, game):
-        """Draw UI elements"""
-        # Draw instructions
-        instructions = [
-            "Player 1 (Red): Q=Hit, A=Dodge",
-            "Player 2 (Green): W=Hit, S=Dodge", 
-            "Player 3 (Blue): E=Hit, D=Dodge",
-            "Player 4 (Yellow): R=Hit, F=Dodge"
-        ]
-        
-        for i, instruction in enumerate(instructions):
+    def draw_instructions(self, screen):
+        """Draw the key bindings (part of the local game's background)"""
+        for i, instruction in enumerate(INSTRUCTIONS):
             text = self.small_font.render(instruction, True, PLAYER_COLORS[i])
             screen.blit(text, (10, 10 + i * 25))
-        
+    
+    def draw_ui(self, screen, game):
+        """Draw UI elements"""
         # Draw game over screen
         if game.game_over:
             if game.winner:
-                text = self.font.render(f"Player {game.winner.id + 1} Wins!", True, game.winner.color)
+                text = self.text(self.font, f"Player {game.winner.id + 1} Wins!", game.winner.color)
             else:
-                text = self.font.render("Game Over!", True, BLACK)
+                text = self.text(self.font, "Game Over!", BLACK)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, 50))
             screen.blit(text, text_rect)
             
-            restart_text = self.small_font.render("Press SPACE to restart", True, BLACK)
+            restart_text = self.text(self.small_font, "Press SPACE to restart", BLACK)
             screen.blit(restart_text, (10, 150))
     
-    def render_online_game(self, screen, game_state, my_player_id):
+    def render_online_game(self, screen, game_state, my_player_id, net_stats=None):
         """Render the game from network state"""
         if not game_state:
             return
             
-        # Clear screen
-        screen.fill(WHITE)
-        
-        # Draw planet
-        self.draw_planet(screen)
+        # Clear screen, draw planet and controls
+        self.draw_background(screen, self.draw_controls)
         
         # Draw players from network data
         for player_data in game_state.get('players', []):
             self.draw_network_player(screen, player_data, my_player_id)
         
-        # Draw ball from network data
-        ball_data = game_state.get('ball', {})
-        self.draw_network_ball(screen, ball_data)
+        # Draw ball from network data (absent until the first trajectory arrives)
+        ball_data = game_state.get('ball')
+        if ball_data:
+            self.draw_network_ball(screen, ball_data)
         
         # Draw UI
-        self.draw_online_ui(screen, game_state, my_player_id)
+        self.draw_online_ui(screen, game_state, my_player_id, net_stats)
     
     def draw_network_player(self, screen, player_data, my_player_id):
         """Draw a player from network data"""
@@ -145,36 +178,25 @@ class GameRenderer:
             
         if state == 2:  # DODGING
             # Draw as smaller circle when dodging
-            pygame.draw.circle(screen, color, (int(x), int(y)), PLAYER_RADIUS // 2)
+            self.circle(screen, color, (int(x), int(y)), PLAYER_RADIUS // 2)
         else:
             # Draw player
-            pygame.draw.circle(screen, color, (int(x), int(y)), PLAYER_RADIUS)
+            self.circle(screen, color, (int(x), int(y)), PLAYER_RADIUS)
             
             # Draw stick
             if state in [1, 3, 5]:  # STANDING, SWINGING, FLYING_OFF
                 stick_length = 35
                 
-                # Set base angle based on player position
-                if player_id == 0:  # Player 1 (bottom) - horizontal, pointing right
-                    base_angle = 0
-                elif player_id == 1:  # Player 2 (left) - vertical, pointing up
-                    base_angle = math.pi/2
-                elif player_id == 2:  # Player 3 (top) - horizontal, pointing left
-                    base_angle = math.pi
-                elif player_id == 3:  # Player 4 (right) - vertical, pointing down
-                    base_angle = -math.pi/2
-                
-                swing_offset = math.radians(stick_angle)
-                stick_angle_rad = base_angle + swing_offset
-                
-                stick_end_x = x + stick_length * math.cos(stick_angle_rad)
-                stick_end_y = y + stick_length * math.sin(stick_angle_rad)
+                # Resting direction of the player's seat, turned by the swing
+                dx, dy = stick_direction(player_id, stick_angle)
+                stick_end_x = x + stick_length * dx
+                stick_end_y = y + stick_length * dy
                 pygame.draw.line(screen, BLACK, (int(x), int(y)), 
                                (int(stick_end_x), int(stick_end_y)), 4)
         
         # Highlight current player
         if player_id == my_player_id:
-            pygame.draw.circle(screen, WHITE, (int(x), int(y)), PLAYER_RADIUS + 5, 3)
+            self.circle(screen, WHITE, (int(x), int(y)), PLAYER_RADIUS + 5, 3)
     
     def draw_network_ball(self, screen, ball_data):
         """Draw the ball from network data"""
@@ -187,44 +209,47 @@ class GameRenderer:
             # Draw ball with pulsing effect during countdown
             pulse = abs(math.sin(pygame.time.get_ticks() * 0.01))
             radius = BALL_RADIUS + int(pulse * 5)
-            pygame.draw.circle(screen, (255, 100, 100), (int(x), int(y)), radius)
+            self.circle(screen, (255, 100, 100), (int(x), int(y)), radius)
             
             # Draw countdown timer
             countdown = int(spawn_timer) + 1
-            text = self.font.render(str(countdown), True, BLACK)
+            text = self.text(self.font, str(countdown), BLACK)
             text_rect = text.get_rect(center=(int(x), int(y) - 30))
             screen.blit(text, text_rect)
         else:
             # Draw normal moving ball
-            pygame.draw.circle(screen, BLACK, (int(x), int(y)), BALL_RADIUS)
+            self.circle(screen, BLACK, (int(x), int(y)), BALL_RADIUS)
     
-    def draw_online_ui(self, screen, game_state, my_player_id):
-        """Draw UI for online game"""
-        # Draw controls for current player
-        controls_text = "Your controls: SPACE/UP = Hit, DOWN/ENTER = Dodge"
-        text = self.small_font.render(controls_text, True, BLACK)
+    def draw_controls(self, screen):
+        """Draw the online key bindings (part of the online game's background)"""
+        text = self.small_font.render(ONLINE_CONTROLS, True, BLACK)
         screen.blit(text, (10, SCREEN_HEIGHT - 30))
+    
+    def draw_online_ui(self, screen, game_state, my_player_id, net_stats=None):
+        """Draw UI for online game"""
+        # Draw connection quality
+        if net_stats:
+            net_text = f"RTT {net_stats['rtt_ms']:.0f} ms  jitter {net_stats['jitter_ms']:.0f} ms"
+            text = self.text(self.small_font, net_text, BLACK)
+            screen.blit(text, (SCREEN_WIDTH - text.get_width() - 10, SCREEN_HEIGHT - 30))
         
         # Draw game over screen
         if game_state.get('game_over', False):
             winner_id = game_state.get('winner_id')
             if winner_id is not None:
                 if winner_id == my_player_id:
-                    text = self.font.render("You Win!", True, GREEN)
+                    text = self.text(self.font, "You Win!", GREEN)
                 else:
-                    text = self.font.render(f"Player {winner_id + 1} Wins!", True, RED)
+                    text = self.text(self.font, f"Player {winner_id + 1} Wins!", RED)
             else:
-                text = self.font.render("Game Over!", True, BLACK)
+                text = self.text(self.font, "Game Over!", BLACK)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, 50))
             screen.blit(text, text_rect)
     
     def render(self, screen, game):
         """Render the local game"""
-        # Clear screen
-        screen.fill(WHITE)
-        
-        # Draw planet
-        self.draw_planet(screen)
+        # Clear screen, draw planet and instructions
+        self.draw_background(screen, self.draw_instructions)
         
         # Draw ball
         self.draw_ball(screen, game.ball)